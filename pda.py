@@ -20,20 +20,268 @@
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
+import hashlib
+import inspect
+import os
+import pickle
+import re
+import sys
+
+
+# Integer codes for the stack operations, as used by the compiled
+# transition table (see TwoPDA._compile()). "read" is by far the most
+# common op, so it gets 0 and can be tested for by truthiness alone.
+OP_READ, OP_PUSH, OP_POP, OP_REPLACE = range(4)
+assert OP_READ == 0  # (_run() tests for it by truthiness)
+_OP_CODES = {'read': OP_READ, 'push': OP_PUSH, 'pop': OP_POP, 'replace': OP_REPLACE}
+
+# Extra op code that only exists in compiled tables: skip a run of input
+# bytes that would each just loop back to the same state (see
+# _add_run_skips()). The stack value is the run's regex match function.
+OP_SKIP = 4
+
+# Minimum number of byte values that must loop back to a state for it to
+# get run skips (see _add_run_skips()). Narrower loops, like the ones
+# for names or whitespace, usually only go on for a few bytes, and
+# stepping through those is faster than calling a regex.
+_MIN_RUN_SKIP_BYTES = 128
+
+# Number of free slots to leave in a new stack buffer before it needs to
+# grow (see _run())
+_STACK_BUF_SPARE = 64
+
+# Hashed into cache file names (see TwoPDA._cache_path()); change it
+# whenever the format of the compiled tables changes
+_COMPILED_CACHE_VERSION = b'2'
+
+# Length-1 bytes objects for each byte value, so that transitions keys
+# and consume_character()'s argument can be built from ints without
+# creating a new bytes object every time
+BYTE = tuple(bytes([i]) for i in range(256))
+
+
+def _intern(value):
+    """
+    sys.intern() "value" if it's a string, otherwise return it unchanged
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def _print_nice_indicator(s, i):
     """
     Print a nice indicator showing the position of the character at
     index "i" in bytes "s"
     """
-    newline_before = s.rfind(b'\n', 0, i - 1)
-    newline_after = s.find(b'\n', i)
-    line = repr(s[newline_before + 1 : newline_after])[2:-1]  # "b'" and "'"
-    i -= newline_before + 1
+    line_start = s.rfind(b'\n', 0, i) + 1
+    line_end = s.find(b'\n', i)
+    if line_end == -1:
+        line_end = len(s)
+
+    # Only the part of the input before the current line needs counting
+    line_num = s.count(b'\n', 0, line_start) + 1
+
+    # Escape byte by byte, so that the column can be counted in the
+    # printed line (repr() of a whole string picks its quote style, and
+    # so whether to escape quotes, from the string's contents)
+    escaped = [repr(BYTE[c])[2:-1] for c in s[line_start:line_end]]  # "b'" and "'"
+    line = ''.join(escaped)
+    column = sum(map(len, escaped[:i - line_start]))
 
-    line_num = s.count(b'\n', 0, i - 1) + 1
     line_num_str = f'[line {line_num}]'
     print(line_num_str, line)
-    print(' ' * (len(line_num_str) + 1) + '-' * i + '^')
+    print(' ' * (len(line_num_str) + 1) + '-' * column + '^')
+
+
+
+def _run(input, rows, state, stack, sp):
+    """
+    Run a compiled transition table (see TwoPDA._compile()) over bytes
+    "input", starting from integer state ID "state".
+
+    "stack" is a preallocated list of integer stack symbol IDs, used as
+    the stack with "sp" as a cursor: stack[1:sp + 1] holds the contents
+    (bottom to top), and stack[0] is always 0 (None), so that stack[sp]
+    is the top-of-stack symbol even when the stack is empty. The list is
+    modified in place, and extended if it turns out to be too short.
+
+    Return (final state ID, final sp, index at which parsing stopped);
+    the index is less than len(input) only if no transition could be
+    taken there.
+
+    Everything here is plain integers and lists, so that this loop
+    stays cheap to interpret.
+    """
+    # (Locals, since they're faster to look up in the loop than globals)
+    op_push, op_pop, op_skip = OP_PUSH, OP_POP, OP_SKIP
+
+    i = 0
+    n = len(input)
+    top = stack[sp]
+    while True:
+        try:
+            while i < n:
+                t = rows[state][top][input[i]]
+                if t is None:
+                    break
+
+                new_state, advance, op, value = t
+                if op:  # (OP_READ is 0, and needs nothing doing)
+                    if op == op_push:
+                        stack[sp + 1] = value
+                        sp += 1
+                        top = value
+                    elif op == op_skip:
+                        i = value(input, i).end()
+                    elif not sp:
+                        break
+                    elif op == op_pop:
+                        sp -= 1
+                        top = stack[sp]
+                    else:  # OP_REPLACE
+                        stack[sp] = top = value
+
+                state = new_state
+                i += advance
+
+            return state, sp, i
+
+        except IndexError:
+            # Out of room for a push -- grow the stack and retry
+            stack.extend([0] * len(stack))
+
+
+
+# How two consecutive stack ops combine, for _fold_stay_chains():
+# (first op, second op) -> combined op. Combinations that can't be
+# expressed as a single op are missing.
+_COMBINED_OPS = {
+    (OP_READ, OP_READ): OP_READ,
+    (OP_READ, OP_PUSH): OP_PUSH,
+    (OP_PUSH, OP_READ): OP_PUSH,
+    (OP_PUSH, OP_POP): OP_READ,
+    (OP_PUSH, OP_REPLACE): OP_PUSH,
+    (OP_REPLACE, OP_READ): OP_REPLACE,
+    (OP_REPLACE, OP_POP): OP_POP,
+    (OP_REPLACE, OP_REPLACE): OP_REPLACE,
+}
+
+
+def _fold_stay_chains(rows):
+    """
+    Return a copy of compiled rows (see TwoPDA._compile()) in which
+    chains of "stay" transitions have been followed ahead of time.
+
+    After a transition that doesn't move right, the same byte is read
+    again, so if the stack top is known at that point, the transition
+    taken next is already determined. Each such transition is replaced
+    by the result of following the chain for as long as its combined
+    effect on the stack is still a single op. A pop or replace of
+    whatever was on the stack beforehand is only folded in as the first
+    step of a chain, so that an empty stack is still reported in the
+    same state as before.
+    """
+    num_symbols = len(rows[0])
+    specific_tops = [{u for u in range(1, num_symbols) if r[u] is not r[0]} for r in rows]
+
+    def follow(state, top, c, t):
+        # "top" is 0 for the row shared by all stack tops that have no
+        # transitions of their own in this state
+        new_state, advance, op, value = t
+        steps = 0
+        while not advance and op != OP_POP and steps < len(rows):
+            next_rows = rows[new_state]
+            if op == OP_READ:
+                if not top and any(next_rows[u][c] != next_rows[0][c]
+                                   for u in specific_tops[new_state] - specific_tops[state]):
+                    break  # depends on which of the sharing stack tops it is
+                next_t = next_rows[top][c]
+            else:
+                next_t = next_rows[value][c]
+            if next_t is None:
+                break
+            combined_op = _COMBINED_OPS.get((op, next_t[2]))
+            if combined_op is None:
+                break
+
+            if next_t[2] in (OP_PUSH, OP_REPLACE):
+                value = next_t[3]
+            elif combined_op not in (OP_PUSH, OP_REPLACE):
+                value = 0
+            new_state, advance, op = next_t[0], next_t[1], combined_op
+            steps += 1
+
+        return (new_state, advance, op, value) if steps else t
+
+    folded = {}  # id(original row) -> folded row
+    new_rows = []
+    for state, state_rows in enumerate(rows):
+        for top, row in enumerate(state_rows):
+            if id(row) not in folded:
+                folded[id(row)] = [t if t is None else follow(state, top, c, t)
+                                   for c, t in enumerate(row)]
+        new_rows.append([folded[id(row)] for row in state_rows])
+    return new_rows
+
+
+
+def _add_run_skips(rows):
+    """
+    Find "scanning" states in compiled rows (see TwoPDA._compile()):
+    states in which most bytes just move right and loop back to the
+    same state without touching the stack, like in the middle of a
+    comment or string. Modify the rows in place so that those
+    transitions instead skip over the whole run of such bytes with a
+    single regex match (for the complement of the exit bytes), rather
+    than one step per byte.
+    """
+    for state, state_rows in enumerate(rows):
+        loop = (state, 1, OP_READ, 0)
+        distinct_rows = list({id(row): row for row in state_rows}.values())
+        run_bytes = [c for c in range(256) if all(row[c] == loop for row in distinct_rows)]
+        if len(run_bytes) < _MIN_RUN_SKIP_BYTES:
+            continue
+
+        exit_bytes = bytes(sorted(set(range(256)).difference(run_bytes)))
+        if exit_bytes:
+            pattern = b'[^' + b''.join(re.escape(bytes([c])) for c in exit_bytes) + b']+'
+        else:
+            pattern = b'(?s).+'  # (loops on every byte -- skip to the end)
+        skip = (state, 0, OP_SKIP, re.compile(pattern).match)
+        for row in distinct_rows:
+            for c in run_bytes:
+                row[c] = skip
+
+
+
+def _share_equal_transitions(rows):
+    """
+    Make equal transitions in compiled rows (see TwoPDA._compile()) the
+    same object, modifying the rows in place. Hundreds of thousands of
+    transitions are copies of about a thousand distinct ones, and
+    sharing them makes the tables, and the pickled cache file, much
+    smaller.
+    """
+    shared = {}
+    distinct_rows = {id(row): row for state_rows in rows for row in state_rows}
+    for row in distinct_rows.values():
+        row[:] = [t if t is None else shared.setdefault(t, t) for t in row]
+
+
+
+def _share_equal_rows(rows):
+    """
+    Make equal rows in compiled rows (see TwoPDA._compile()) the same
+    list, including across states, modifying "rows" in place. This has
+    to come last, since the other passes assume that a row only belongs
+    to one state.
+    """
+    shared = {}  # tuple(row) -> row
+    by_id = {}   # id(row) -> shared equal row
+    for state_rows in rows:
+        for top, row in enumerate(state_rows):
+            if id(row) not in by_id:
+                by_id[id(row)] = shared.setdefault(tuple(row), row)
+            state_rows[top] = by_id[id(row)]
 
 
 
@@ -41,6 +289,9 @@ class TwoPDA:
     """
     Class implementing a 2PDA (two-way pushdown automaton)
     """
+    # Per-instance parsing state (everything else is class-level)
+    __slots__ = ('state', '_stack_buf', '_sp')
+
     # name: just a nice string name
     name = ''
 
@@ -66,81 +317,315 @@ class TwoPDA:
     # initial_state: the state to begin at
     initial_state = None
 
+    # cache_compiled: whether to cache the compiled form of the
+    # transitions on disk (see _compile())
+    cache_compiled = True
+
     def __init__(self):
+        self._compile()
         self.state = self.initial_state
         self.stack = []
 
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Remember what the class body set the transitions to (if
+        # anything), since only those are covered by _cache_path()'s hash
+        cls._body_transitions = cls.__dict__.get('transitions')
+
+
+    @property
+    def stack(self):
+        """
+        A snapshot of the contents of the stack (bottom to top), as a
+        tuple. Changing the stack means assigning a new sequence to this
+        property.
+        """
+        names = self._symbol_names
+        return tuple(names[v] for v in self._stack_buf[1 : self._sp + 1])
+
+
+    @stack.setter
+    def stack(self, values):
+        ids = self._symbol_ids
+        unknown = [v for v in values if v not in ids]
+        if unknown:
+            raise ValueError(f'Unknown stack symbols: {unknown}')
+        self._stack_buf = [0] + [ids[v] for v in values] + [0] * _STACK_BUF_SPARE
+        self._sp = len(values)
+
+
     def parse(self, input, *, debug_level=0):
         """
-        Parse an input string (a sequence of characters)
+        Parse an input string (a sequence of characters), given as any
+        bytes-like object (bytes, bytearray, memoryview, mmap, ...)
         """
         if debug_level >= 2:
-            print(f'\n(Starting to parse string starting with {repr(input[:60])}.)')
-        i = 0
-        while i < len(input):
-            try:
-                c = bytes([input[i]])
-                direction = self.consume_character(c, debug_level=debug_level, debug_i=i)
+            self.parse_debug(input, debug_level=debug_level)
+            return
+
+        # A memoryview gives the same fast indexing and slicing for all of
+        # those without copying the input. It's released on the way out
+        # (even when raising), so that an mmap passed in can be closed
+        # while a traceback still refers to this frame.
+        with memoryview(input).cast('B') as input:
+            state, self._sp, i = _run(input, self._rows, self._state_ids[self.state], self._stack_buf, self._sp)
+            self.state = self._state_names[state]
+
+            if i < len(input):
+                self._parse_error(input, i, debug_level=debug_level)
 
-            except:
-                if debug_level >= 1:
-                    # Print some useful debug stuff
-                    print('Error occurs here:')
-                    _print_nice_indicator(input, i)
-                    print('State is:                ', self.state)
-                    print('Stack (bottom to top) is:', ', '.join(self.stack))
-                    print('Parsed character is:     ', input[i], f'(pos. {i})')
 
-                raise RuntimeError(f'Error parsing input string starting with "{input[:20].decode("latin-1")}", at index {i}')
+    def parse_debug(self, input, *, debug_level=2):
+        """
+        Parse an input string like parse(), but one consume_character()
+        call at a time, directly from the transitions dictionary, and
+        printing each step (and more, if debug_level >= 3). This is
+        much slower than parse() (which calls this for debug_level >= 2).
+        """
+        with memoryview(input).cast('B') as input:  # (see parse())
+            print(f'\n(Starting to parse string starting with {repr(bytes(input[:60]))}.)')
+
+            consume_character = self.consume_character
+            i = 0
+            n = len(input)
+            while i < n:
+                direction = consume_character(BYTE[input[i]], debug_level=debug_level, debug_i=i)
+                if direction is None:
+                    self._parse_error(input, i, debug_level=debug_level)
 
-            if direction == 'right':
-                i += 1
+                if direction == 'right':
+                    i += 1
+
+
+    def _parse_error(self, input, i, *, debug_level=0):
+        """
+        Report a parse error at index "i" of the input string
+        """
+        if debug_level >= 1:
+            # Print some useful debug stuff
+            print('Error occurs here:')
+            _print_nice_indicator(bytes(input), i)
+            print('State is:                ', self.state)
+            print('Stack (bottom to top) is:', ', '.join(self.stack))
+            print('Parsed character is:     ', input[i], f'(pos. {i})')
+
+        # (Only copy the part of the input that's shown)
+        start = bytes(input[:20]).decode('latin-1')
+        raise RuntimeError(f'Error parsing input string starting with "{start}", at index {i}')
 
 
     def consume_character(self, c, *, debug_level=0, debug_i=0):
         """
         Parse a single character and take the appropriate transition.
         Return the direction ("right"|"stay") to move in the input
-        string.
+        string, or None if no transition can be taken.
         """
+        stack = self._stack_buf
+        sp = self._sp
+        transitions = self.transitions or {}
+
         transitionsKey = None
-        if self.stack:
-            transitionsKey = (self.state, c, self.stack[-1])
-        if transitionsKey not in self.transitions:
+        if sp:
+            transitionsKey = (self.state, c, self._symbol_names[stack[sp]])
+        if transitionsKey not in transitions:
             transitionsKey = (self.state, c, None)
-            if transitionsKey not in self.transitions:
-                raise RuntimeError(f'No transition found for "{c}" (state: {self.state}; stack: {self.stack})')
+            if transitionsKey not in transitions:
+                return None
 
-        newState, direction, op, value = self.transitions[transitionsKey]
+        newState, direction, op, value = transitions[transitionsKey]
         if debug_level >= 3:
-            print(f'    Following {transitionsKey} -> {self.transitions[transitionsKey]}')
+            print(f'    Following {transitionsKey} -> {transitions[transitionsKey]}')
 
         if op == 'push':
-            self.stack.append(value)
-        elif op == 'pop':
-            self.stack.pop()
+            if sp + 1 == len(stack):
+                stack.extend([0] * len(stack))
+            stack[sp + 1] = self._symbol_ids[value]
+            self._sp = sp + 1
         elif op == 'read':
             pass
-        elif op == 'replace':
-            self.stack[-1] = value
-        else:
+        elif op not in ('pop', 'replace'):
             raise RuntimeError(f'Unknown transition op: "{op}"')
+        elif not sp:
+            return None
+        elif op == 'pop':
+            self._sp = sp - 1
+        else:
+            stack[sp] = self._symbol_ids[value]
 
         self.state = newState
 
         if debug_level >= 2:
-            print(repr(c)[1:-1], f'({debug_i})', self.stack, self.state)
+            print(repr(c)[1:-1], f'({debug_i})', list(self.stack), self.state)
 
         return direction
 
 
+    @classmethod
+    def _compile(cls):
+        """
+        Set up the integer-only tables used by _run() (see
+        _build_tables()), if that hasn't been done yet for this class.
+        If cache_compiled is set, they're loaded from (or saved to) a
+        cache file when possible.
+        """
+        if cls.__dict__.get('_rows') is not None:
+            return
+
+        # (A class without transitions, like TwoPDA itself, can still be
+        # instantiated; it just can't parse anything but empty input)
+        cache_path = cls._cache_path() if cls.cache_compiled and cls.transitions else None
+        tables = None
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    tables = pickle.load(f)
+            except Exception:
+                pass  # missing or unreadable -- just rebuild it
+
+        if tables is None:
+            tables = cls._build_tables()
+            if cache_path is not None:
+                cls._save_cache(cache_path, tables)
+
+        # Intern the names handed out by self.state and the stack property,
+        # so that consume_character()'s lookup keys can compare by identity
+        # with literal names in the transitions (which Python interns)
+        state_names, symbol_names, rows = tables
+        state_names = [_intern(name) for name in state_names]
+        symbol_names = [_intern(value) for value in symbol_names]
+        cls._state_ids = {name: i for i, name in enumerate(state_names)}
+        cls._state_names = state_names
+        cls._symbol_ids = {value: i for i, value in enumerate(symbol_names)}
+        cls._symbol_names = symbol_names
+        cls._rows = rows
+
+
+    @classmethod
+    def _build_tables(cls):
+        """
+        Translate the transitions dictionary into integer-only tables.
+        States and stack symbols are numbered in order of first
+        appearance; stack symbol 0 is None (i.e. "no stack-top
+        requirement", or an empty stack).
+
+        Return (state names, stack symbols, rows), where the names and
+        symbols are lists indexed by ID, and
+            rows[state_id][stack_top_id][byte] -> (new_state_id, advance, op_code, stack_value_id)
+        or None if there's no transition. advance is the amount to move
+        right in the input (1 for "right", 0 for "stay"), and op_code
+        is from _OP_CODES, or OP_SKIP. Stack-top-specific transitions
+        are merged with the None ones ahead of time, so most stack tops
+        just share the state's default row.
+        """
+        state_ids = {}
+        symbol_ids = {None: 0}
+        def state_id(name):
+            return state_ids.setdefault(name, len(state_ids))
+        def symbol_id(value):
+            return symbol_ids.setdefault(value, len(symbol_ids))
+
+        state_id(cls.initial_state)
+        by_stack_top = {}  # (state_id, stack_top_id) -> {byte: transition}
+        for (state, c, stack_top), (new_state, direction, op, value) in (cls.transitions or {}).items():
+            if op not in _OP_CODES:
+                raise RuntimeError(f'Unknown transition op: "{op}"')
+            by_stack_top.setdefault((state_id(state), symbol_id(stack_top)), {})[c[0]] = (
+                state_id(new_state), int(direction == 'right'), _OP_CODES[op], symbol_id(value))
+
+        num_symbols = len(symbol_ids)
+        rows = []
+        for s in range(len(state_ids)):
+            default_row = [None] * 256
+            for c, t in by_stack_top.get((s, 0), {}).items():
+                default_row[c] = t
+            rows.append([default_row] * num_symbols)
+        for (s, stack_top), row_transitions in by_stack_top.items():
+            if stack_top:
+                row = rows[s][stack_top] = rows[s][0].copy()
+                for c, t in row_transitions.items():
+                    row[c] = t
+
+        rows = _fold_stay_chains(rows)
+        _add_run_skips(rows)
+        _share_equal_transitions(rows)
+        _share_equal_rows(rows)
+        return list(state_ids), list(symbol_ids), rows
+
+
+    @classmethod
+    def _cache_path(cls):
+        """
+        Return the path of the file to cache this class's compiled
+        tables in, or None if there's nowhere suitable.
+
+        The file name has the class's module and qualified name, and a
+        hash of the source code of the class and its bases (which covers
+        the transitions, the compiler, and any overrides of it). Hashing
+        the transitions themselves would cost about ten times as much as
+        loading the cache, so classes whose transitions might not match
+        their source aren't cached: ones defined inside functions, and
+        ones whose transitions were replaced after the class body ran.
+        The file goes in the __pycache__ directory next to the
+        subclass's module.
+        """
+        if '<locals>' in cls.__qualname__:
+            return None
+        for klass in cls.__mro__:
+            if 'transitions' in klass.__dict__:
+                if klass.__dict__['transitions'] is not klass.__dict__.get('_body_transitions'):
+                    return None
+                break
+
+        digest = hashlib.sha256(_COMPILED_CACHE_VERSION)
+        digest.update(repr(cls.initial_state).encode())
+        for klass in cls.__mro__[:-1]:  # (skip "object")
+            try:
+                with open(inspect.getfile(klass), 'rb') as f:
+                    digest.update(f.read())
+            except (OSError, TypeError):
+                return None
+
+        directory = os.path.join(os.path.dirname(inspect.getfile(cls)), '__pycache__')
+        filename = f'{cls.__module__}.{cls.__qualname__}.{digest.hexdigest()[:16]}.2pda'
+        return os.path.join(directory, filename)
+
+
+    @staticmethod
+    def _save_cache(path, tables):
+        """
+        Write compiled tables to a cache file, then remove any stale
+        cache files for the same class. Failures are ignored, since
+        the cache is only an optimization.
+        """
+        directory, filename = os.path.split(path)
+        stem = filename.rsplit('.', 2)[0]  # (module and qualified name)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(tables, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+
+            for other in os.listdir(directory):
+                if other != filename and other.endswith('.2pda') and other.rsplit('.', 2)[0] == stem:
+                    try:
+                        os.remove(os.path.join(directory, other))
+                    except OSError:
+                        pass  # (probably removed by another process already)
+        except OSError:
+            pass
+
+
     @classmethod
     def print_stats(cls):
         """
         Convenience function to print some statistics about the 2PDA
         """
 
+        # (One pass doing everything is faster here than separate set
+        # comprehensions or zip(*...) transposes, which need several
+        # passes over the hundreds of thousands of transitions)
         states = set()
         stack_symbols = set()
         for a, b in cls.transitions.items():
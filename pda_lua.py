@@ -19,6 +19,7 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import functools
 import string
 
 import pda
@@ -26,39 +27,28 @@ import pda
 
 def bstr_to_set(b):
     """
-    Convert a byte string to a set of the length-1 bytes obejcts within it.
+    Convert a byte string to a frozenset of the byte values (ints)
+    within it.
     """
-    return set(bytes([c]) for c in b)
+    return frozenset(b)
 
 
+@functools.lru_cache(maxsize=None)
 def u8_complement(s):
     """
-    Return the set of all length-1 bytes objects not in s (which is of
-    type bytes, or set of length-1 bytes objects).
+    Return the set of all byte values not in s (which is of type bytes,
+    or a frozenset of byte values). Results are cached, since the same
+    complements are asked for by every call of the subsystem readers.
     """
-    return without(ALL, s)
+    return ALL.difference(s)
 
 
 def without(s, removals):
     """
-    Return the set of all length-1 bytes objects in s and not in removals
-    (both of which are either of type bytes, or set of length-1 bytes objects).
+    Return the set of all byte values in s and not in removals (both of
+    which are either of type bytes, or sets of byte values).
     """
-    if isinstance(s, bytes):
-        s = bstr_to_set(s)
-    elif isinstance(s, set):
-        s = set(s)
-    else:
-        raise TypeError(s)
-
-    if isinstance(removals, bytes):
-        removals = bstr_to_set(removals)
-    elif not isinstance(removals, set):
-        raise TypeError(removals)
-
-    for r in removals:
-        s.remove(r)
-    return s
+    return frozenset(s).difference(removals)
 
 # See lctype.h
 ALL = bstr_to_set(bytes(range(0x100)))
@@ -79,6 +69,13 @@ NOT_LISXDIGIT = u8_complement(IN_LISXDIGIT)
 DIGITS = bstr_to_set(b'0123456789')
 ONLY_HEX_DIGITS = bstr_to_set(b'abcdefABCDEF')
 HEX_DIGITS = DIGITS | ONLY_HEX_DIGITS
+NOT_DIGITS = u8_complement(DIGITS)
+
+# Complements used by more than one subsystem
+NOT_MINUS = u8_complement(b'-')
+NOT_EQUALS = u8_complement(b'=')
+NOT_EQUALS_OR_RBRACKET = u8_complement(b'=]')
+NOT_EQUALS_OR_LBRACKET = u8_complement(b'[=')
 
 
 def _make_transitions():
@@ -133,18 +130,20 @@ def _make_transitions():
         this_stack_value = 'comment__' + start_state
 
         # Skip any whitespace while on the start state
+        skip_whitespace = (start_state, 'right', 'read', None)
         for c in IN_LISSPACE:
-            transitions[(start_state, c, required_stack_value)] = (start_state, 'right', 'read', None)
+            transitions[(start_state, pda.BYTE[c], required_stack_value)] = skip_whitespace
 
         # Comment?
         transitions[(start_state, b'-', required_stack_value)] = ('possible_comment_-', 'right', 'push', this_stack_value)
 
         # If we're in "possible_comment_-", and read anything other than "-", transition to minus_transition
         # (after popping this_stack_value off the stack)
-        for c in u8_complement(b'-'):
-            intermediate_state = 'possible_comment_-__' + start_state
-            transitions[('possible_comment_-', c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-            transitions[(intermediate_state, c, None)] = minus_transition
+        intermediate_state = 'possible_comment_-__' + start_state
+        pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
+        for c in NOT_MINUS:
+            transitions[('possible_comment_-', pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+            transitions[(intermediate_state, pda.BYTE[c], None)] = minus_transition
         # If there is another "-", we'll pick it up in the general comment parser.
 
         # End of a single-line comment -- return to original state
@@ -187,25 +186,29 @@ def _make_transitions():
         # Enter subsystem
         # Precondition: in start_state, with nothing on top of stack
         # Postcondition: in "name_or_keyword" state, with this_stack_value on top of stack
+        push_this_stack_value = ('name_or_keyword', 'stay', 'push', this_stack_value)
         for c in IN_LISLALPHA:
-            transitions[(start_state, c, required_stack_value)] = ('name_or_keyword', 'stay', 'push', this_stack_value)
+            transitions[(start_state, pda.BYTE[c], required_stack_value)] = push_this_stack_value
 
         # Exit subsystem (name)
         # Precondition: in "name" state, with this_stack_value on top of stack
         # Postcondition: taking name_transition, with nothing on top of stack
+        intermediate_state = 'name_from__' + start_state
+        pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
         for c in NOT_LISLALNUM:
-            intermediate_state = 'name_from__' + start_state
-            transitions[('name', c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-            transitions[(intermediate_state, c, None)] = name_transition
+            transitions[('name', pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+            transitions[(intermediate_state, pda.BYTE[c], None)] = name_transition
 
         # Exit subsystem (keyword)
         # Precondition: in any of the "keyword_[keyword]" states, with this_stack_value on top of stack
         # Postcondition: taking keyword_transition, with keyword on top of stack
         for keyword in KEYWORDS:
-            intermediate_state = 'keyword_' + keyword + '_from__' + start_state
+            keyword_state = 'keyword_' + keyword
+            intermediate_state = keyword_state + '_from__' + start_state
+            replace_with_keyword = (intermediate_state, 'stay', 'replace', keyword)
             for c in NOT_LISLALNUM:
-                transitions[('keyword_' + keyword, c, this_stack_value)] = (intermediate_state, 'stay', 'replace', keyword)
-                transitions[(intermediate_state, c, None)] = keyword_transition
+                transitions[(keyword_state, pda.BYTE[c], this_stack_value)] = replace_with_keyword
+                transitions[(intermediate_state, pda.BYTE[c], None)] = keyword_transition
 
 
     def read_name_list(start_state, name_transition, keyword_transition, *, required_stack_value=None):
@@ -244,33 +247,39 @@ def _make_transitions():
         # Enter subsystem
         # Precondition: in start_state, with nothing on top of stack
         # Postcondition: in "name" state, with this_stack_value on top of stack
+        push_this_stack_value = ('name_list_start', 'stay', 'push', this_stack_value)
         for c in ALL:
-            transitions[(start_state, c, required_stack_value)] = ('name_list_start', 'stay', 'push', this_stack_value)
+            transitions[(start_state, pda.BYTE[c], required_stack_value)] = push_this_stack_value
 
         # Exit subsystem (usual route)
         # Precondition: in "name_list_exit_name" state, with this_stack_value on top of stack
         # Postcondition: taking name_transition, with nothing on top of stack
+        intermediate_state = 'name_list_exit_name_from__' + start_state
+        pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
         for c in ALL:
-            intermediate_state = 'name_list_exit_name_from__' + start_state
-            transitions[('name_list_exit_name', c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-            transitions[(intermediate_state, c, None)] = name_transition
+            transitions[('name_list_exit_name', pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+            transitions[(intermediate_state, pda.BYTE[c], None)] = name_transition
 
         # Exit subsystem (keyword encountered)
         # Precondition: in "name_list_exit_keyword" state, with keyword name above this_stack_value on top of stack
         # Postcondition: taking keyword_transition, with the keyword on top of stack
-        for c in ALL:
-            for k in KEYWORDS:
-                intermediate_state_1 = f'name_list_exit_keyword__{k}'
-                intermediate_state_2 = f'name_list_exit_keyword__{k}__from__{start_state}'
-                intermediate_state_3 = f'name_list_exit_keyword_from__{start_state}'
+        intermediate_state_3 = f'name_list_exit_keyword_from__{start_state}'
+        for k in KEYWORDS:
+            intermediate_state_1 = f'name_list_exit_keyword__{k}'
+            intermediate_state_2 = f'name_list_exit_keyword__{k}__from__{start_state}'
+            pop_keyword = (intermediate_state_1, 'stay', 'pop', None)
+            pop_this_stack_value = (intermediate_state_2, 'stay', 'pop', None)
+            push_keyword = (intermediate_state_3, 'stay', 'push', k)
+            for c in ALL:
                 # Pop the keyword off the stack, and put it in the state name instead
-                transitions[('name_list_exit_keyword', c, k)] = (intermediate_state_1, 'stay', 'pop', None)
+                transitions[('name_list_exit_keyword', pda.BYTE[c], k)] = pop_keyword
                 # Pop the "this_stack_value" off the stack, and put it in the state name instead
-                transitions[(intermediate_state_1, c, this_stack_value)] = (intermediate_state_2, 'stay', 'pop', None)
+                transitions[(intermediate_state_1, pda.BYTE[c], this_stack_value)] = pop_this_stack_value
                 # Push the keyword back onto the stack
-                transitions[(intermediate_state_2, c, None)] = (intermediate_state_3, 'stay', 'push', k)
-                # Take the actual final transition
-                transitions[(intermediate_state_3, c, None)] = keyword_transition
+                transitions[(intermediate_state_2, pda.BYTE[c], None)] = push_keyword
+        # Take the actual final transition
+        for c in ALL:
+            transitions[(intermediate_state_3, pda.BYTE[c], None)] = keyword_transition
 
 
     def read_lvalue_or_rvalue(start_state, already_read_name, transition, minus_transition, period_transition, colon_transition,
@@ -345,8 +354,9 @@ def _make_transitions():
         # Postcondition: in "lrvalue_start_1" or "lrvalue_start_2"
         #     state (depending on already_read_name), with
         #     this_stack_value on top of stack
+        push_this_stack_value = ('lrvalue_start_' + entry_point, 'stay', 'push', this_stack_value)
         for c in ALL:
-            transitions[(start_state, c, None)] = ('lrvalue_start_' + entry_point, 'stay', 'push', this_stack_value)
+            transitions[(start_state, pda.BYTE[c], None)] = push_this_stack_value
 
         # Exit subsystem
         # AND
@@ -378,27 +388,36 @@ def _make_transitions():
                             to_push.append(exit_option_2)
                         to_push.append(exit_option_1)
 
+                        # Work out the chain of transitions that pushes
+                        # to_push, so the character loop only has to
+                        # store them
+                        chain = []
+                        current_intermediate_state = intermediate_state_1
+                        next_intermediate_state_num = 1
+                        action = 'replace' # replace the first time; push subsequent times
+                        stack_value_to_check_against = this_stack_value # this_stack_value the first time; None subsequent times
+
+                        for tp in to_push:
+                            next_intermediate_state = extra_intermediate_state + '__' + str(next_intermediate_state_num)
+                            chain.append((current_intermediate_state, stack_value_to_check_against,
+                                          (next_intermediate_state, 'stay', action, tp)))
+
+                            # prepare for next iteration
+                            action = 'push'
+                            stack_value_to_check_against = None
+                            current_intermediate_state = next_intermediate_state
+                            next_intermediate_state_num += 1
+
+                        chain.append((current_intermediate_state, None, this_transition))
+
+                        exit_state = f'lrvalue{mod}_exit'
+                        pop_state_stack_value = (intermediate_state_1, 'stay', 'pop', None)
                         for c in ALL:
                             # pop state_stack_value
-                            transitions[(f'lrvalue{mod}_exit', c, state_stack_value)] = (intermediate_state_1, 'stay', 'pop', None)
-
-                            current_intermediate_state = intermediate_state_1
-                            next_intermediate_state_num = 1
-                            action = 'replace' # replace the first time; push subsequent times
-                            stack_value_to_check_against = this_stack_value # this_stack_value the first time; None subsequent times
+                            transitions[(exit_state, pda.BYTE[c], state_stack_value)] = pop_state_stack_value
 
-                            for tp in to_push:
-                                next_intermediate_state = extra_intermediate_state + '__' + str(next_intermediate_state_num)
-                                transitions[(current_intermediate_state, c, stack_value_to_check_against)] = \
-                                    (next_intermediate_state, 'stay', action, tp)
-
-                                # prepare for next iteration
-                                action = 'push'
-                                stack_value_to_check_against = None
-                                current_intermediate_state = next_intermediate_state
-                                next_intermediate_state_num += 1
-
-                            transitions[(current_intermediate_state, c, None)] = this_transition
+                            for state, stack_value, this_chain_transition in chain:
+                                transitions[(state, pda.BYTE[c], stack_value)] = this_chain_transition
 
         # Exit subsystem (keyword)
         # Precondition: in "lrvalue_exit_keyword" state, with the
@@ -408,10 +427,12 @@ def _make_transitions():
         for keyword in KEYWORDS:
             intermediate_state_1 = f'lrvalue_exit_keyword_with__' + keyword
             intermediate_state_2 = f'lrvalue_exit_keyword_from__' + start_state + '__with__' + keyword
+            pop_keyword = (intermediate_state_1, 'stay', 'pop', None)
+            replace_with_keyword = (intermediate_state_2, 'stay', 'replace', keyword)
             for c in ALL:
-                transitions[('lrvalue_exit', c, keyword)] = (intermediate_state_1, 'stay', 'pop', None)
-                transitions[(intermediate_state_1, c, this_stack_value)] = (intermediate_state_2, 'stay', 'replace', keyword)
-                transitions[(intermediate_state_2, c, None)] = keyword_transition
+                transitions[('lrvalue_exit', pda.BYTE[c], keyword)] = pop_keyword
+                transitions[(intermediate_state_1, pda.BYTE[c], this_stack_value)] = replace_with_keyword
+                transitions[(intermediate_state_2, pda.BYTE[c], None)] = keyword_transition
 
 
     def _lrvalue_init_stack_state_and_read_next_part(start_state, characters_to_transition_on, right_or_stay,
@@ -419,13 +440,15 @@ def _make_transitions():
         """
         Helper function for the LRvalue subsystem to initialize the
         stack state to represent certain values, and then transition to
-        lrvalue_read_next_part
+        lrvalue_read_next_part.
+
+        characters_to_transition_on can be a bytes object or a set of
+        byte values, since both iterate as ints.
         """
         stack_value = lvalue_or_rvalue_vs_rvalue + '__' + only_name_vs_not_only_name + '__' + function_call_vs_not_function_call
-        if isinstance(characters_to_transition_on, bytes):
-            characters_to_transition_on = bstr_to_set(characters_to_transition_on)
+        push_stack_value = ('lrvalue_read_next_part', right_or_stay, 'push', stack_value)
         for c in characters_to_transition_on:
-            transitions[(start_state, c, None)] = ('lrvalue_read_next_part', right_or_stay, 'push', stack_value)
+            transitions[(start_state, pda.BYTE[c], None)] = push_stack_value
 
 
     def _lrvalue_set_stack_state_and_read_next_part(start_state, characters_to_transition_on, right_or_stay,
@@ -434,14 +457,16 @@ def _make_transitions():
         """
         Helper function for the LRvalue subsystem to change the stack
         state to represent certain values, and then transition to
-        lrvalue_read_next_part
+        lrvalue_read_next_part.
+
+        characters_to_transition_on can be a bytes object or a set of
+        byte values, since both iterate as ints.
         """
         target_state = 'lrvalue_read_next_part' + ('_:' if is_colon_version else '')
         stack_value = lvalue_or_rvalue_vs_rvalue + '__' + only_name_vs_not_only_name + '__' + function_call_vs_not_function_call
-        if isinstance(characters_to_transition_on, bytes):
-            characters_to_transition_on = bstr_to_set(characters_to_transition_on)
+        replace_with_stack_value = (target_state, right_or_stay, 'replace', stack_value)
         for c in characters_to_transition_on:
-            transitions[(start_state, c, None)] = (target_state, right_or_stay, 'replace', stack_value)
+            transitions[(start_state, pda.BYTE[c], None)] = replace_with_stack_value
 
 
     def read_expression(start_state, transition,
@@ -513,9 +538,10 @@ def _make_transitions():
         # Postcondition: in "expression" state, with 'beginning' (from
         #     CHECK_IF_ONLY_NAME_STACK_SYMBOLS) on top of stack, and
         #     this_stack_value just below it
+        push_this_stack_value = ('expression_start', 'stay', 'push', this_stack_value)
         for c in ALL:
-            transitions[(start_state, c, required_stack_value)] = ('expression_start', 'stay', 'push', this_stack_value)
-            transitions[('expression_start', c, None)] = ('expression', 'stay', 'push', 'beginning')
+            transitions[(start_state, pda.BYTE[c], required_stack_value)] = push_this_stack_value
+            transitions[('expression_start', pda.BYTE[c], None)] = ('expression', 'stay', 'push', 'beginning')
         read_whitespace('expression_start',
             ('expression_start', 'stay', 'read', None))
         # ^ "exp ::= - exp" is a valid grammar production, so if
@@ -534,22 +560,27 @@ def _make_transitions():
                                       ('_=', equals_transition),
                                       ('_trailing_name', trailing_name_transition),
                                       ('_:', colon_transition)]:
+            exit_state = f'expression_exit{type}'
+            intermediate_state_2 = f'expression_exit{type}_from__' + start_state
+            for symb in CHECK_IF_ONLY_NAME_STACK_SYMBOLS:
+                # Pop stack symbol and put it in the state name
+                intermediate_state_1 = f'expression_exit{type}_with__' + symb
+                pop_symb = (intermediate_state_1, 'stay', 'pop', None)
+
+                # Pop this_stack_value and either replace it with the
+                # stack symbol, or don't
+                if check_if_only_name:
+                    exit_action = (intermediate_state_2, 'stay', 'replace', symb)
+                else:
+                    exit_action = (intermediate_state_2, 'stay', 'pop', None)
+
+                for c in ALL:
+                    transitions[(exit_state, pda.BYTE[c], symb)] = pop_symb
+                    transitions[(intermediate_state_1, pda.BYTE[c], this_stack_value)] = exit_action
+
+            # Transition out using the transition provided to us
             for c in ALL:
-                for symb in CHECK_IF_ONLY_NAME_STACK_SYMBOLS:
-                    # Pop stack symbol and put it in the state name
-                    intermediate_state_1 = f'expression_exit{type}_with__' + symb
-                    transitions[(f'expression_exit{type}', c, symb)] = (intermediate_state_1, 'stay', 'pop', None)
-
-                    # Pop this_stack_value and either replace it with the
-                    # stack symbol, or don't
-                    intermediate_state_2 = f'expression_exit{type}_from__' + start_state
-                    if check_if_only_name:
-                        transitions[(intermediate_state_1, c, this_stack_value)] = (intermediate_state_2, 'stay', 'replace', symb)
-                    else:
-                        transitions[(intermediate_state_1, c, this_stack_value)] = (intermediate_state_2, 'stay', 'pop', None)
-                
-                # Transition out using the transition provided to us
-                transitions[(intermediate_state_2, c, None)] = this_transition
+                transitions[(intermediate_state_2, pda.BYTE[c], None)] = this_transition
 
         # Exit subsystem ("end" / "elseif" / "else" / "until" / ";" / ")" encountered)
         # Precondition: in "expression_exit_end" or "expression_exit_;"
@@ -564,11 +595,15 @@ def _make_transitions():
                                       ('until', until_transition),
                                       (';', semicolon_transition),
                                       (')', rparen_transition)]:
+            exit_state = f'expression_exit_{k}'
+            exit_state_1 = f'expression_exit_{k}_1'
             intermediate_state = 'expression_exit_' + k + '_from__' + start_state
+            pop_symb = (exit_state_1, 'stay', 'pop', None)
+            pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
             for c in ALL:
-                transitions[(f'expression_exit_{k}', c, None)] = (f'expression_exit_{k}_1', 'stay', 'pop', None)
-                transitions[(f'expression_exit_{k}_1', c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-                transitions[(intermediate_state, c, None)] = special_transition
+                transitions[(exit_state, pda.BYTE[c], None)] = pop_symb
+                transitions[(exit_state_1, pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+                transitions[(intermediate_state, pda.BYTE[c], None)] = special_transition
 
 
     def read_expression_list(start_state, transition,
@@ -604,16 +639,18 @@ def _make_transitions():
         # Enter subsystem
         # Precondition: in start_state, with nothing on top of stack
         # Postcondition: in "expression_list_start" state, with this_stack_value on top of stack
+        push_this_stack_value = ('expression_list_start', 'stay', 'push', this_stack_value)
         for c in ALL:
-            transitions[(start_state, c, required_stack_value)] = ('expression_list_start', 'stay', 'push', this_stack_value)
+            transitions[(start_state, pda.BYTE[c], required_stack_value)] = push_this_stack_value
 
         # Exit subsystem
         # Precondition: in "expression_list_exit" state, with this_stack_value on top of stack
         # Postcondition: taking transition, with nothing on top of stack
+        intermediate_state = 'expression_list_exit_from__' + start_state
+        pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
         for c in ALL:
-            intermediate_state = 'expression_list_exit_from__' + start_state
-            transitions[('expression_list_exit', c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-            transitions[(intermediate_state, c, None)] = transition
+            transitions[('expression_list_exit', pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+            transitions[(intermediate_state, pda.BYTE[c], None)] = transition
 
         # Exit subsystem ("end" / "elseif" / "else" / "until" / ";" / ")" / trailing-name encountered)
         # Precondition: in "expression_list_exit_{keyword}" state, with this_stack_value on top of stack
@@ -626,10 +663,12 @@ def _make_transitions():
                          (')', rparen_transition),
                          ('trailing_name', trailing_name_transition),
                          (':', colon_transition)]:
+            exit_state = 'expression_list_exit_' + k
+            intermediate_state = f'expression_list_exit_{k}_from__' + start_state
+            pop_this_stack_value = (intermediate_state, 'stay', 'pop', None)
             for c in ALL:
-                intermediate_state = f'expression_list_exit_{k}_from__' + start_state
-                transitions[('expression_list_exit_' + k, c, this_stack_value)] = (intermediate_state, 'stay', 'pop', None)
-                transitions[(intermediate_state, c, None)] = trans
+                transitions[(exit_state, pda.BYTE[c], this_stack_value)] = pop_this_stack_value
+                transitions[(intermediate_state, pda.BYTE[c], None)] = trans
 
 
     ####################################################################
@@ -665,8 +704,9 @@ def _make_transitions():
 
     # Read initial '[', and push a '' onto the stack (representing
     # the number of ='s read so far)
+    opening_fail = (f'{MCOLS}_end_opening_fail', 'stay', 'read', None)
     for c in ALL:
-        transitions[(f'{MCOLS}_start', c, None)] = (f'{MCOLS}_end_opening_fail', 'stay', 'read', None)
+        transitions[(f'{MCOLS}_start', pda.BYTE[c], None)] = opening_fail
     transitions[(f'{MCOLS}_start', b'[', None)] = (f'{MCOLS}_start_[', 'right', 'push', '')
 
     # ALTERNATIVE ENTRY POINT
@@ -674,13 +714,14 @@ def _make_transitions():
     # or a '='. Push a '' onto the stack (representing the number of ='s
     # read so far)
     for c in ALL:
-        transitions[(f'{MCOLS}_start_2', c, None)] = (f'{MCOLS}_end_opening_fail', 'stay', 'read', None)
+        transitions[(f'{MCOLS}_start_2', pda.BYTE[c], None)] = opening_fail
     transitions[(f'{MCOLS}_start_2', b'[', None)] = (f'{MCOLS}_start_[', 'stay', 'push', '')
     transitions[(f'{MCOLS}_start_2', b'=', None)] = (f'{MCOLS}_start_[', 'stay', 'push', '')
 
     # Read 1-N equals
-    for c in u8_complement(b'='):
-        transitions[(f'{MCOLS}_start_[', c, None)] = (f'{MCOLS}_end_opening_fail', 'stay', 'pop', None)
+    opening_fail_pop = (f'{MCOLS}_end_opening_fail', 'stay', 'pop', None)
+    for c in NOT_EQUALS:
+        transitions[(f'{MCOLS}_start_[', pda.BYTE[c], None)] = opening_fail_pop
     for i in range(1, EQUALS_TO_SUPPORT + 1):
         transitions[(f'{MCOLS}_start_[', b'=', '=' * (i - 1))] = (f'{MCOLS}_start_[', 'right', 'replace', '=' * i)
 
@@ -694,15 +735,17 @@ def _make_transitions():
     # on the stack (as one stack symbol).
 
     # Skip over stuff
+    skip_contents = (MCOLS, 'right', 'read', None)
     for c in ALL:
-        transitions[(MCOLS, c, None)] = (MCOLS, 'right', 'read', None)
+        transitions[(MCOLS, pda.BYTE[c], None)] = skip_contents
 
     # Detect start of possible ending
     transitions[(MCOLS, b']', None)] = (f'{MCOLS}_possible_end', 'right', 'push', '')
 
     # Detect failed possible endings via invalid characters
-    for c in u8_complement(b'=]'):
-        transitions[(f'{MCOLS}_possible_end', c, None)] = (MCOLS, 'right', 'pop', None)
+    possible_end_fail = (MCOLS, 'right', 'pop', None)
+    for c in NOT_EQUALS_OR_RBRACKET:
+        transitions[(f'{MCOLS}_possible_end', pda.BYTE[c], None)] = possible_end_fail
     # Count equals
     for i in range(1, EQUALS_TO_SUPPORT + 1):
         transitions[(f'{MCOLS}_possible_end', b'=', '=' * (i - 1))] = (f'{MCOLS}_possible_end', 'right', 'replace', '=' * i)
@@ -728,14 +771,14 @@ def _make_transitions():
 
     # Comment! Is it the "--" form, or the "--[=*[" form?
     for c in ALL:
-        transitions[('comment_start', c, None)] = ('comment_single_line', 'stay', 'read', None)
+        transitions[('comment_start', pda.BYTE[c], None)] = ('comment_single_line', 'stay', 'read', None)
     transitions[('comment_start', b'[', None)] = \
         ('multiline_comment_or_long_string_start', 'stay', 'push', 'multiline_comment')
 
     # Single-line form: read until end of line, then go back to the whitespace state
     # Note: newline characters are defined as '\n' and '\r'; see currIsNewline() in llex.c
     for c in u8_complement(b'\r\n'):
-        transitions[('comment_single_line', c, None)] = ('comment_single_line', 'right', 'read', None)
+        transitions[('comment_single_line', pda.BYTE[c], None)] = ('comment_single_line', 'right', 'read', None)
     # \r and \n will be consumed in read_whitespace()
 
     # Multi-line form. Pop our 'multline_comment' stack symbol
@@ -743,7 +786,7 @@ def _make_transitions():
     transitions[('multiline_comment_or_long_string_end', b']', 'multiline_comment')] = \
         ('comment_multiline_end', 'stay', 'pop', None)
     for c in ALL:
-        transitions[('multiline_comment_or_long_string_end_opening_fail', c, 'multiline_comment')] = \
+        transitions[('multiline_comment_or_long_string_end_opening_fail', pda.BYTE[c], 'multiline_comment')] = \
             ('comment_single_line', 'stay', 'pop', None)
 
 
@@ -762,7 +805,7 @@ def _make_transitions():
 
     # Skip over alphanumeric characters while in the "name" state
     for c in IN_LISLALNUM:
-        transitions[('name', c, None)] = ('name', 'right', 'read', None)
+        transitions[('name', pda.BYTE[c], None)] = ('name', 'right', 'read', None)
     # (Exiting the state when a non-alphanum character is read is
     # handled by read_name_or_keyword().)
 
@@ -771,25 +814,26 @@ def _make_transitions():
 
     # If the first thing we read isn't the start of a keyword, go to the name state
     for c in IN_LISLALNUM:
-        transitions[('name_or_keyword', c, None)] = ('name', 'stay', 'read', None)
+        transitions[('name_or_keyword', pda.BYTE[c], None)] = ('name', 'stay', 'read', None)
 
     # Now we'll replace some of those to look for actual keywords.
-    for keyword in KEYWORDS:
+    # Partial keywords are the nodes of a trie over KEYWORDS, so list each
+    # shared prefix (like "e" for "else", "elseif" and "end") only once
+    keyword_prefixes = dict.fromkeys(keyword[:i] for keyword in KEYWORDS for i in range(1, len(keyword) + 1))
+    for keyword_so_far in keyword_prefixes:
         # If we have a partial keyword on the stack, but get literally
         # anything other than what we're looking for, pop the
         # in-progress keyword off the stack and go to the name state to
         # handle it like a name
         for c in ALL:
-            keyword_so_far = ''
-            for k in keyword:
-                keyword_so_far += k
-                transitions[('name_or_keyword', c, keyword_so_far)] = ('name', 'stay', 'pop', None)
+            transitions[('name_or_keyword', pda.BYTE[c], keyword_so_far)] = ('name', 'stay', 'pop', None)
 
     for keyword in KEYWORDS:
         # If we complete the full keyword and encounter something
         # non-alphanumeric, go to the appropriate keyword state
+        pop_keyword = ('keyword_' + keyword, 'stay', 'pop', None)
         for c in NOT_LISLALNUM:
-            transitions[('name_or_keyword', c, keyword)] = ('keyword_' + keyword, 'stay', 'pop', None)
+            transitions[('name_or_keyword', pda.BYTE[c], keyword)] = pop_keyword
         # (read_name_or_keyword() takes it from here.)
 
         # Actual primary sequence of transitions for the keyword
@@ -815,7 +859,7 @@ def _make_transitions():
     # If we read an actual name, either read a comma and read a second name,
     # or go to the exit state
     for c in ALL:
-        transitions[('name_list_entry_end', c, None)] = ('name_list_exit_name', 'stay', 'read', None)
+        transitions[('name_list_entry_end', pda.BYTE[c], None)] = ('name_list_exit_name', 'stay', 'read', None)
     read_whitespace('name_list_entry_end', FAIL_TRANSITION)
     transitions[('name_list_entry_end', b',', None)] = ('name_list_start_2', 'right', 'read', None)
     read_whitespace('name_list_start_2', FAIL_TRANSITION)
@@ -907,7 +951,7 @@ def _make_transitions():
 
     # Almost all characters should be read as normal
     for c in u8_complement(b'\r\n\\'):
-        transitions[('short_string', c, None)] = ('short_string', 'right', 'read', None)
+        transitions[('short_string', pda.BYTE[c], None)] = ('short_string', 'right', 'read', None)
 
     # Allow embedding the opposite quote character
     transitions[('short_string', b'"', "'")] = ('short_string', 'right', 'read', None)
@@ -918,22 +962,22 @@ def _make_transitions():
 
     # Easy single-character ones
     for c in bstr_to_set(b'abfnrtv' b'\\' b'"' b"'" b'\n'):
-        transitions[('short_string_esc_seq', c, None)] = ('short_string', 'right', 'read', None)
+        transitions[('short_string_esc_seq', pda.BYTE[c], None)] = ('short_string', 'right', 'read', None)
 
     # \z: skips all following whitespace characters including linebreaks.
     # NOTE: that means IN_LISSPACE, not read_whitespace() (which would
     # skip over Lua comments)
     transitions[('short_string_esc_seq', b'z', None)] = ('short_string_esc_seq_z', 'right', 'read', None)
     for c in IN_LISSPACE:
-        transitions[('short_string_esc_seq_z', c, None)] = ('short_string_esc_seq_z', 'right', 'read', None)
+        transitions[('short_string_esc_seq_z', pda.BYTE[c], None)] = ('short_string_esc_seq_z', 'right', 'read', None)
     for c in NOT_LISSPACE:
-        transitions[('short_string_esc_seq_z', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_z', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # \xXX: hexadecimal literal
     transitions[('short_string_esc_seq', b'x', None)] = ('short_string_esc_seq_x', 'right', 'read', None)
     for c in HEX_DIGITS:
-        transitions[('short_string_esc_seq_x', c, None)] = ('short_string_esc_seq_x_X', 'right', 'read', None)
-        transitions[('short_string_esc_seq_x_X', c, None)] = ('short_string', 'right', 'read', None)
+        transitions[('short_string_esc_seq_x', pda.BYTE[c], None)] = ('short_string_esc_seq_x_X', 'right', 'read', None)
+        transitions[('short_string_esc_seq_x_X', pda.BYTE[c], None)] = ('short_string', 'right', 'read', None)
 
     # \d, \dd, \ddd: decimal literal
     # This is tricky for two reasons:
@@ -944,46 +988,46 @@ def _make_transitions():
 
     # If the first digit is 0 or 1, no overflow potential
     for d in bstr_to_set(b'01'):
-        transitions[('short_string_esc_seq', d, None)] = ('short_string_esc_seq_01', 'right', 'read', None)
+        transitions[('short_string_esc_seq', pda.BYTE[d], None)] = ('short_string_esc_seq_01', 'right', 'read', None)
     for d in DIGITS:
-        transitions[('short_string_esc_seq_01', d, None)] = ('short_string_esc_seq_01_*', 'right', 'read', None)
-        transitions[('short_string_esc_seq_01_*', d, None)] = ('short_string', 'right', 'read', None)
-    for c in u8_complement(DIGITS):
-        transitions[('short_string_esc_seq_01', c, None)] = ('short_string', 'stay', 'read', None)
-        transitions[('short_string_esc_seq_01_*', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_01', pda.BYTE[d], None)] = ('short_string_esc_seq_01_*', 'right', 'read', None)
+        transitions[('short_string_esc_seq_01_*', pda.BYTE[d], None)] = ('short_string', 'right', 'read', None)
+    for c in NOT_DIGITS:
+        transitions[('short_string_esc_seq_01', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_01_*', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # If the first digit is 3-9, it will overflow iff the escape is 3 digits long
     for d in bstr_to_set(b'3456789'):
-        transitions[('short_string_esc_seq', d, None)] = ('short_string_esc_seq_3-9', 'right', 'read', None)
+        transitions[('short_string_esc_seq', pda.BYTE[d], None)] = ('short_string_esc_seq_3-9', 'right', 'read', None)
     for d in DIGITS:
-        transitions[('short_string_esc_seq_3-9', d, None)] = ('short_string_esc_seq_3-9_*', 'right', 'read', None)
-    for c in u8_complement(DIGITS):
-        transitions[('short_string_esc_seq_3-9', c, None)] = ('short_string', 'stay', 'read', None)
-        transitions[('short_string_esc_seq_3-9_*', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_3-9', pda.BYTE[d], None)] = ('short_string_esc_seq_3-9_*', 'right', 'read', None)
+    for c in NOT_DIGITS:
+        transitions[('short_string_esc_seq_3-9', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_3-9_*', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # If the first digit is 2, it *might* overflow depending on the following digits,
     # so separate it into "2_0-4", "2_5", and "2_6-9" categories
     transitions[('short_string_esc_seq', b'2', None)] = ('short_string_esc_seq_2', 'right', 'read', None)
     for d in bstr_to_set(b'01234'): # Second digit is 0-4: no overflow potential
-        transitions[('short_string_esc_seq_2', d, None)] = ('short_string_esc_seq_2_0-4', 'right', 'read', None)
+        transitions[('short_string_esc_seq_2', pda.BYTE[d], None)] = ('short_string_esc_seq_2_0-4', 'right', 'read', None)
     transitions[('short_string_esc_seq_2', b'5', None)] = ('short_string_esc_seq_2_5', 'right', 'read', None)
     for d in bstr_to_set(b'6789'): # Second digit is 6-9: will overflow iff escape is 3 digits long
-        transitions[('short_string_esc_seq_2', d, None)] = ('short_string_esc_seq_2_6-9', 'right', 'read', None)
-    for c in u8_complement(DIGITS):
-        transitions[('short_string_esc_seq_2', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_2', pda.BYTE[d], None)] = ('short_string_esc_seq_2_6-9', 'right', 'read', None)
+    for c in NOT_DIGITS:
+        transitions[('short_string_esc_seq_2', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # Handle the easy "2_0-4" and "2_6-9" cases from above
     for d in DIGITS:
-        transitions[('short_string_esc_seq_2_0-4', d, None)] = ('short_string', 'right', 'read', None)
-    for c in u8_complement(DIGITS):
-        transitions[('short_string_esc_seq_2_0-4', c, None)] = ('short_string', 'stay', 'read', None)
-        transitions[('short_string_esc_seq_2_6-9', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_2_0-4', pda.BYTE[d], None)] = ('short_string', 'right', 'read', None)
+    for c in NOT_DIGITS:
+        transitions[('short_string_esc_seq_2_0-4', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_2_6-9', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # Handle the more complicated case where we have \25[something]
     for d in bstr_to_set(b'012345'): # only valid digits to follow \25
-        transitions[('short_string_esc_seq_2_5', d, None)] = ('short_string', 'right', 'read', None)
-    for c in u8_complement(DIGITS):
-        transitions[('short_string_esc_seq_2_5', c, None)] = ('short_string', 'stay', 'read', None)
+        transitions[('short_string_esc_seq_2_5', pda.BYTE[d], None)] = ('short_string', 'right', 'read', None)
+    for c in NOT_DIGITS:
+        transitions[('short_string_esc_seq_2_5', pda.BYTE[c], None)] = ('short_string', 'stay', 'read', None)
 
     # \u{XXX}: Unicode  literal
     # Notes:
@@ -999,45 +1043,24 @@ def _make_transitions():
     transitions[('short_string_esc_seq_u{_0', b'0', None)] = ('short_string_esc_seq_u{_0', 'right', 'read', None)
     # Step 2: differentiate based on initial character 1-7 vs 8-F
     for d in bstr_to_set(b'1234567'):
-        transitions[('short_string_esc_seq_u{', d, None)] = ('short_string_esc_seq_u{_1-7', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_0', d, None)] = ('short_string_esc_seq_u{_1-7', 'right', 'read', None)
+        transitions[('short_string_esc_seq_u{', pda.BYTE[d], None)] = ('short_string_esc_seq_u{_1-7', 'right', 'read', None)
+        transitions[('short_string_esc_seq_u{_0', pda.BYTE[d], None)] = ('short_string_esc_seq_u{_1-7', 'right', 'read', None)
     for d in bstr_to_set(b'89') | ONLY_HEX_DIGITS:
-        transitions[('short_string_esc_seq_u{', d, None)] = ('short_string_esc_seq_u{_8-F', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_0', d, None)] = ('short_string_esc_seq_u{_8-F', 'right', 'read', None)
-    # Step 3 (if first nonzero digit was 1-7): read up to 7 more chars
-    for d in HEX_DIGITS:
-        transitions[('short_string_esc_seq_u{_1-7', d, None)] = ('short_string_esc_seq_u{_1-7_+1', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+1', d, None)] = ('short_string_esc_seq_u{_1-7_+2', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+2', d, None)] = ('short_string_esc_seq_u{_1-7_+3', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+3', d, None)] = ('short_string_esc_seq_u{_1-7_+4', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+4', d, None)] = ('short_string_esc_seq_u{_1-7_+5', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+5', d, None)] = ('short_string_esc_seq_u{_1-7_+6', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_1-7_+6', d, None)] = ('short_string_esc_seq_u{_1-7_+7', 'right', 'read', None)
-    # Step 3 (if first nonzero digit was 8-F): read up to 6 more chars
-    for d in HEX_DIGITS:
-        transitions[('short_string_esc_seq_u{_8-F', d, None)] = ('short_string_esc_seq_u{_8-F_+1', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_8-F_+1', d, None)] = ('short_string_esc_seq_u{_8-F_+2', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_8-F_+2', d, None)] = ('short_string_esc_seq_u{_8-F_+3', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_8-F_+3', d, None)] = ('short_string_esc_seq_u{_8-F_+4', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_8-F_+4', d, None)] = ('short_string_esc_seq_u{_8-F_+5', 'right', 'read', None)
-        transitions[('short_string_esc_seq_u{_8-F_+5', d, None)] = ('short_string_esc_seq_u{_8-F_+6', 'right', 'read', None)
+        transitions[('short_string_esc_seq_u{', pda.BYTE[d], None)] = ('short_string_esc_seq_u{_8-F', 'right', 'read', None)
+        transitions[('short_string_esc_seq_u{_0', pda.BYTE[d], None)] = ('short_string_esc_seq_u{_8-F', 'right', 'read', None)
+    # Step 3: read up to 7 more chars if the first nonzero digit was 1-7,
+    # or up to 6 more if it was 8-F
     # Step 4: read "}" from states that should allow it
     transitions[('short_string_esc_seq_u{_0', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+1', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+2', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+3', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+4', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+5', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+6', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_1-7_+7', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+1', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+2', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+3', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+4', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+5', b'}', None)] = ('short_string', 'right', 'read', None)
-    transitions[('short_string_esc_seq_u{_8-F_+6', b'}', None)] = ('short_string', 'right', 'read', None)
+    for first_digit, more_chars in [('1-7', 7), ('8-F', 6)]:
+        u_states = [f'short_string_esc_seq_u{{_{first_digit}']
+        u_states += [f'{u_states[0]}_+{n}' for n in range(1, more_chars + 1)]
+        for u_state, next_u_state in zip(u_states, u_states[1:]):
+            read_digit = (next_u_state, 'right', 'read', None)
+            for d in HEX_DIGITS:
+                transitions[(u_state, pda.BYTE[d], None)] = read_digit
+        for u_state in u_states:
+            transitions[(u_state, b'}', None)] = ('short_string', 'right', 'read', None)
 
     # Detect end
     transitions[('short_string', b"'", "'")] = ('short_string_end', 'right', 'pop', None)
@@ -1067,7 +1090,7 @@ def _make_transitions():
     # "a = {-23}"), but the field that follows HAS to be of the
     # "field ::= exp" form. (Sub-note: "exp ::= '-' exp" is a correct rule.)
     for c in ALL:
-        transitions[('table_constructor_whitespace_before_field', c, None)] = ('table_constructor_before_field', 'stay', 'read', None)
+        transitions[('table_constructor_whitespace_before_field', pda.BYTE[c], None)] = ('table_constructor_before_field', 'stay', 'read', None)
     read_whitespace('table_constructor_whitespace_before_field',
         ('table_constructor_before_field_-', 'stay', 'read', None))
 
@@ -1079,9 +1102,9 @@ def _make_transitions():
     # next character, and respond accordingly.
 
     for c in ALL:
-        transitions[('table_constructor_before_field', c, None)] = ('table_constructor_field_[', 'right', 'read', None)
-    for c in u8_complement(b'[='):
-        transitions[('table_constructor_field_[', c, None)] = ('table_constructor_field_[_before_exp', 'stay', 'read', None)
+        transitions[('table_constructor_before_field', pda.BYTE[c], None)] = ('table_constructor_field_[', 'right', 'read', None)
+    for c in NOT_EQUALS_OR_LBRACKET:
+        transitions[('table_constructor_field_[', pda.BYTE[c], None)] = ('table_constructor_field_[_before_exp', 'stay', 'read', None)
     transitions[('table_constructor_field_[', b'[', None)] = ('table_constructor_field_[[_or_[=', 'stay', 'read', None)
     transitions[('table_constructor_field_[', b'=', None)] = ('table_constructor_field_[[_or_[=', 'stay', 'read', None)
 
@@ -1091,7 +1114,7 @@ def _make_transitions():
     transitions[('multiline_comment_or_long_string_end', b']', 'table_constructor_long_string_field_exp')] = \
         ('table_constructor_field_after_name_or_exp_before_whitespace', 'right', 'push', 'not_only_name')
     for c in ALL:
-        transitions[('table_constructor_field_after_name_or_exp_before_whitespace', c, None)] = ('table_constructor_field_after_name_or_exp', 'stay', 'read', None)
+        transitions[('table_constructor_field_after_name_or_exp_before_whitespace', pda.BYTE[c], None)] = ('table_constructor_field_after_name_or_exp', 'stay', 'read', None)
     read_whitespace('table_constructor_field_after_name_or_exp_before_whitespace',
         FAIL_TRANSITION) # TODO: ...this technically wouldn't be a syntax error, right?
     # (^ push 'not_only_name' to match the result of the
@@ -1112,8 +1135,8 @@ def _make_transitions():
     # ======== "field ::= Name ‘=’ exp" AND "field ::= exp" ========
 
     for c in u8_complement(b'['):
-        transitions[('table_constructor_before_field', c, None)] = ('table_constructor_field_name_or_exp', 'stay', 'push', 'did_not_have_minus')
-        transitions[('table_constructor_before_field_-', c, None)] = ('table_constructor_field_name_or_exp', 'stay', 'push', 'had_minus')
+        transitions[('table_constructor_before_field', pda.BYTE[c], None)] = ('table_constructor_field_name_or_exp', 'stay', 'push', 'did_not_have_minus')
+        transitions[('table_constructor_before_field_-', pda.BYTE[c], None)] = ('table_constructor_field_name_or_exp', 'stay', 'push', 'had_minus')
 
     read_expression('table_constructor_field_name_or_exp',
         ('table_constructor_field_after_name_or_exp', 'stay', 'read', None),
@@ -1130,8 +1153,8 @@ def _make_transitions():
     # (only counts if "did_not_have_minus" is on stack below "only_name")
     
     for c in ALL:
-        transitions[('table_constructor_field_after_name_or_exp_=_(1)', c, 'only_name')] = ('table_constructor_field_name_=_(2)', 'stay', 'pop', None)
-        transitions[('table_constructor_field_name_=_(2)', c, 'did_not_have_minus')] = ('table_constructor_field_name_=_(3)', 'stay', 'pop', None)
+        transitions[('table_constructor_field_after_name_or_exp_=_(1)', pda.BYTE[c], 'only_name')] = ('table_constructor_field_name_=_(2)', 'stay', 'pop', None)
+        transitions[('table_constructor_field_name_=_(2)', pda.BYTE[c], 'did_not_have_minus')] = ('table_constructor_field_name_=_(3)', 'stay', 'pop', None)
     read_expression('table_constructor_field_name_=_(3)',
         ('table_constructor_field_name_=_exp', 'stay', 'read', None))
     transitions[('table_constructor_field_name_=_exp', b',', None)] = ('table_constructor_whitespace_before_field', 'right', 'read', None)
@@ -1161,7 +1184,7 @@ def _make_transitions():
     # ======== Entry point 1: haven't read a name yet ========
 
     for c in IN_LISLALPHA:
-        transitions[('lrvalue_start_1', c, None)] = ('lrvalue_start_1_name_or_keyword', 'stay', 'read', None)
+        transitions[('lrvalue_start_1', pda.BYTE[c], None)] = ('lrvalue_start_1_name_or_keyword', 'stay', 'read', None)
 
     transitions[('lrvalue_start_1', b'(', None)] = ('lrvalue_start_1_expression', 'right', 'read', None)
     read_expression('lrvalue_start_1_expression',
@@ -1185,7 +1208,7 @@ def _make_transitions():
 
     # Exit if we get an unexpected character; otherwise, read whitespace
     for c in ALL:
-        transitions[('lrvalue_read_next_part', c, None)] = ('lrvalue_exit', 'stay', 'read', None)
+        transitions[('lrvalue_read_next_part', pda.BYTE[c], None)] = ('lrvalue_exit', 'stay', 'read', None)
     read_whitespace('lrvalue_read_next_part',
         ('lrvalue_-_exit', 'stay', 'read', None))
 
@@ -1220,16 +1243,16 @@ def _make_transitions():
     # { }
     transitions[('lrvalue_read_func_args_{', b'{', None)] = ('table_constructor_start', 'stay', 'push', 'lrvalue_read_func_args_{}')
     for c in ALL:
-        transitions[('table_constructor_end', c, 'lrvalue_read_func_args_{}')] = ('lrvalue_read_func_args_{_}', 'stay', 'pop', None)
+        transitions[('table_constructor_end', pda.BYTE[c], 'lrvalue_read_func_args_{}')] = ('lrvalue_read_func_args_{_}', 'stay', 'pop', None)
     _lrvalue_set_stack_state_and_read_next_part('lrvalue_read_func_args_{_}', ALL, 'stay',
         'rvalue', 'not_only_name', 'function_call')
 
     # ' ' or " "
     for quote in bstr_to_set(b'\'"'):
-        transitions[('lrvalue_read_func_args_"', quote, None)] = ('short_string_start', 'stay', 'push', 'lrvalue_short_string')
+        transitions[('lrvalue_read_func_args_"', pda.BYTE[quote], None)] = ('short_string_start', 'stay', 'push', 'lrvalue_short_string')
     # (Note: the 'rvalue' was already put on the stack by read-next-part)
     for c in ALL:
-        transitions[('short_string_end', c, 'lrvalue_short_string')] = ('lrvalue_read_func_args_"_"', 'stay', 'pop', None)
+        transitions[('short_string_end', pda.BYTE[c], 'lrvalue_short_string')] = ('lrvalue_read_func_args_"_"', 'stay', 'pop', None)
     _lrvalue_set_stack_state_and_read_next_part('lrvalue_read_func_args_"_"', ALL, 'stay',
         'rvalue', 'not_only_name', 'function_call')
 
@@ -1250,8 +1273,8 @@ def _make_transitions():
 
     # We already went past the first '[', so, read the following
     # character now
-    for c in u8_complement(b'[='):
-        transitions[('lrvalue_read_[', c, None)] = ('lrvalue_read_[_membership', 'stay', 'replace', 'lvalue_or_rvalue')
+    for c in NOT_EQUALS_OR_LBRACKET:
+        transitions[('lrvalue_read_[', pda.BYTE[c], None)] = ('lrvalue_read_[_membership', 'stay', 'replace', 'lvalue_or_rvalue')
     transitions[('lrvalue_read_['        , b'[', None)] = ('lrvalue_read_[[_func_args', 'stay', 'read', None)
     transitions[('lrvalue_read_[_after_:', b'[', None)] = ('lrvalue_read_[[_func_args', 'stay', 'read', None)
     transitions[('lrvalue_read_['        , b'=', None)] = ('lrvalue_read_[[_func_args', 'stay', 'read', None)
@@ -1275,7 +1298,7 @@ def _make_transitions():
 
     # We already consumed the ".".
     for c in ALL:
-        transitions[('lrvalue_read_.', c, None)] = ('lrvalue_read_._after_whitespace', 'stay', 'read', None)
+        transitions[('lrvalue_read_.', pda.BYTE[c], None)] = ('lrvalue_read_._after_whitespace', 'stay', 'read', None)
     transitions[('lrvalue_read_.', b'.', None)] = ('lrvalue_._exit', 'stay', 'read', None)
     read_whitespace('lrvalue_read_.', FAIL_TRANSITION)
     read_name_or_keyword('lrvalue_read_._after_whitespace',
@@ -1289,7 +1312,7 @@ def _make_transitions():
     # Similar to '.', except that the name *must* be followed by a
     # function call.
     for c in ALL:
-        transitions[('lrvalue_read_:', c, None)] = ('lrvalue_read_:_after_whitespace', 'stay', 'read', None)
+        transitions[('lrvalue_read_:', pda.BYTE[c], None)] = ('lrvalue_read_:_after_whitespace', 'stay', 'read', None)
     transitions[('lrvalue_read_:', b':', None)] = ('lrvalue_:_exit', 'stay', 'read', None)
     read_whitespace('lrvalue_read_:', FAIL_TRANSITION)
     read_name_or_keyword('lrvalue_read_:_after_whitespace',
@@ -1309,13 +1332,13 @@ def _make_transitions():
     # Helper state that changes the check_if_only_name state to
     # 'not_only_name' and transitions to expression_end
     for c in ALL:
-        transitions[('expression_binop-or-end_with_not_only_name', c, None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
+        transitions[('expression_binop-or-end_with_not_only_name', pda.BYTE[c], None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
 
     # Helper state that reads any whitespace before going back to
     # expression (used by unary operators)
     # Does NOT change the only_name/not_only_name state!
     for c in ALL:
-        transitions[('expression_restart', c, None)] = ('expression', 'stay', 'read', None)
+        transitions[('expression_restart', pda.BYTE[c], None)] = ('expression', 'stay', 'read', None)
     read_whitespace('expression_restart',
         ('expression_restart', 'stay', 'read', None))
     # ^ see explanatory comment for similar code chunk at the start of
@@ -1327,7 +1350,7 @@ def _make_transitions():
     # operator and handles appropriately, or finds something else and
     # goes to expression_exit
     for c in ALL:
-        transitions[('expression_binop-or-end', c, None)] = ('expression_exit', 'stay', 'read', None)
+        transitions[('expression_binop-or-end', pda.BYTE[c], None)] = ('expression_exit', 'stay', 'read', None)
 
     # Start with all of the punctuation-based ones, because those are
     # relatively easy-ish
@@ -1335,20 +1358,19 @@ def _make_transitions():
     TWO_CHAR_BINOPS = [b'//', b'>>', b'<<', b'..', b'<=', b'>=', b'==', b'~=']
 
     for c in ONE_CHAR_BINOPS:
-        transitions[('expression_binop-or-end', c, None)] = ('expression_restart', 'right', 'replace', 'not_only_name')
+        transitions[('expression_binop-or-end', pda.BYTE[c], None)] = ('expression_restart', 'right', 'replace', 'not_only_name')
 
     for c1, c2 in TWO_CHAR_BINOPS:
-        c1, c2 = bytes([c1]), bytes([c2])
-        transitions[('expression_binop-or-end', c1, None)] = ('expression_binop_' + c1.decode('cp1252'), 'right', 'read', None)
-        transitions[('expression_binop_' + c1.decode('cp1252'), c2, None)] = ('expression_restart', 'right', 'replace', 'not_only_name')
+        transitions[('expression_binop-or-end', pda.BYTE[c1], None)] = ('expression_binop_' + chr(c1), 'right', 'read', None)
+        transitions[('expression_binop_' + chr(c1), pda.BYTE[c2], None)] = ('expression_restart', 'right', 'replace', 'not_only_name')
 
         if c1 in ONE_CHAR_BINOPS:
-            all_c2s_for_this_c1 = set(bytes([bo[1]]) for bo in TWO_CHAR_BINOPS if bytes([bo[0]]) == c1)
+            all_c2s_for_this_c1 = frozenset(bo[1] for bo in TWO_CHAR_BINOPS if bo[0] == c1)
             for c in u8_complement(all_c2s_for_this_c1):
-                transitions[('expression_binop_' + c1.decode('cp1252'), c, None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
+                transitions[('expression_binop_' + chr(c1), pda.BYTE[c], None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
 
-    for c in u8_complement(b'='):
-        transitions[('expression_binop_=', c, None)] = ('expression_exit_=', 'stay', 'read', None)
+    for c in NOT_EQUALS:
+        transitions[('expression_binop_=', pda.BYTE[c], None)] = ('expression_exit_=', 'stay', 'read', None)
 
     # "and" / "or"...
     transitions[('expression_binop-or-end', b'a', None)] = ('expression_binop_andoror', 'stay', 'read', None)
@@ -1357,10 +1379,10 @@ def _make_transitions():
         ('expression_exit_trailing_name', 'stay', 'read', None),    # (read a name)
         ('expression_binop_andoror_keyword', 'stay', 'read', None)) # (read a keyword)
     for c in ALL:
-        transitions[('expression_binop_andoror_keyword', c, 'and')] = ('expression_binop_and', 'stay', 'pop', None)
-        transitions[('expression_binop_and', c, None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
-        transitions[('expression_binop_andoror_keyword', c, 'or')] = ('expression_binop_or', 'stay', 'pop', None)
-        transitions[('expression_binop_or', c, None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
+        transitions[('expression_binop_andoror_keyword', pda.BYTE[c], 'and')] = ('expression_binop_and', 'stay', 'pop', None)
+        transitions[('expression_binop_and', pda.BYTE[c], None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
+        transitions[('expression_binop_andoror_keyword', pda.BYTE[c], 'or')] = ('expression_binop_or', 'stay', 'pop', None)
+        transitions[('expression_binop_or', pda.BYTE[c], None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
 
     # (And add a read_whitespace() call to the expression_binop-or-end state.)
     read_whitespace('expression_binop-or-end', ('expression_restart', 'stay', 'replace', 'not_only_name'))
@@ -1381,45 +1403,57 @@ def _make_transitions():
         check_if_only_name=True)
 
     # Handle the check_if_only_name stuff appropriately
-    for c in ALL:
-        for has_colon in [False, True]:
-            ealrv = 'expression_after_lrvalue' + ('_:' if has_colon else '')
+    # (State names are built once per state rather than once per
+    # character, so every key for a state shares the same string)
+    for has_colon in [False, True]:
+        ealrv = 'expression_after_lrvalue' + ('_:' if has_colon else '')
+        ealrv_2 = f'{ealrv}_2'
+        ealrv_only_name = f'{ealrv}__only_name'
+        ealrv_not_only_name = f'{ealrv}__not_only_name'
+        target = 'expression_exit_:' if has_colon else 'expression_binop-or-end'
+
+        pop_to_ealrv_2 = (ealrv_2, 'stay', 'pop', None)
+        pop_to_ealrv_only_name = (ealrv_only_name, 'stay', 'pop', None)
+        pop_to_ealrv_not_only_name = (ealrv_not_only_name, 'stay', 'pop', None)
+        replace_with_only_name = (target, 'stay', 'replace', 'only_name')
+        replace_with_not_only_name = (target, 'stay', 'replace', 'not_only_name')
 
+        for c in ALL:
             # Normal and colon exits from read_lvalue_or_rvalue()
 
             # We don't care about rvalue vs lvalue_or_rvalue
-            transitions[(ealrv, c, None)] = \
-                (f'{ealrv}_2', 'stay', 'pop', None)
+            transitions[(ealrv, pda.BYTE[c], None)] = pop_to_ealrv_2
 
             # Check what the "only_name" vs "not_only_name" state from
             # read_lvalue_or_rvalue was
-            transitions[(f'{ealrv}_2', c, 'only_name')] = \
-                (f'{ealrv}__only_name', 'stay', 'pop', None)
-            transitions[(f'{ealrv}_2', c, 'not_only_name')] = \
-                (f'{ealrv}__not_only_name', 'stay', 'pop', None)
+            transitions[(ealrv_2, pda.BYTE[c], 'only_name')] = pop_to_ealrv_only_name
+            transitions[(ealrv_2, pda.BYTE[c], 'not_only_name')] = pop_to_ealrv_not_only_name
 
             # Compare that to our own, and combine appropriately
-            target = 'expression_exit_:' if has_colon else 'expression_binop-or-end'
-            transitions[(f'{ealrv}__only_name', c, 'beginning')] = \
-                (target, 'stay', 'replace', 'only_name')
-            transitions[(f'{ealrv}__only_name', c, None)] = \
-                (target, 'stay', 'replace', 'not_only_name')
-            transitions[(f'{ealrv}__not_only_name', c, None)] = \
-                (target, 'stay', 'replace', 'not_only_name')
-
-        # "-" and "." exits from read_lvalue_or_rvalue()
-        for mod in ['_-', '_.']:
+            transitions[(ealrv_only_name, pda.BYTE[c], 'beginning')] = replace_with_only_name
+            transitions[(ealrv_only_name, pda.BYTE[c], None)] = replace_with_not_only_name
+            transitions[(ealrv_not_only_name, pda.BYTE[c], None)] = replace_with_not_only_name
+
+    # "-" and "." exits from read_lvalue_or_rvalue()
+    for mod in ['_-', '_.']:
+        ealrv = f'expression_after_lrvalue{mod}'
+        ealrv_2 = f'{ealrv}_2'
+        ealrv_3 = f'{ealrv}_3'
+
+        pop_to_ealrv_2 = (ealrv_2, 'stay', 'pop', None)
+        pop_to_ealrv_3 = (ealrv_3, 'stay', 'pop', None)
+
+        for c in ALL:
             # We don't care about rvalue vs lvalue_or_rvalue
-            transitions[(f'expression_after_lrvalue{mod}', c, None)] = \
-                (f'expression_after_lrvalue{mod}_2', 'stay', 'pop', None)
+            transitions[(ealrv, pda.BYTE[c], None)] = pop_to_ealrv_2
 
             # Nor do we care about "only_name" vs "not_only_name"
-            transitions[(f'expression_after_lrvalue{mod}_2', c, None)] = \
-                (f'expression_after_lrvalue{mod}_3', 'stay', 'pop', None)
+            transitions[(ealrv_2, pda.BYTE[c], None)] = pop_to_ealrv_3
 
+    for c in ALL:
         # For "-", we've already consumed the whole binop, so just go
         # to expression_restart right away.
-        transitions[('expression_after_lrvalue_-_3', c, None)] = \
+        transitions[('expression_after_lrvalue_-_3', pda.BYTE[c], None)] = \
             ('expression_restart', 'stay', 'replace', 'not_only_name')
 
         # For ".", only go to expression_restart if we can consume
@@ -1430,16 +1464,16 @@ def _make_transitions():
     # ======== Expressions that start with a keyword ========
 
     for c in NOT_LISLALNUM:
-        transitions[('expression_starting_with_keyword', c, 'nil')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'false')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'true')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'end')] = ('expression_exit_end', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'elseif')] = ('expression_exit_elseif', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'else')] = ('expression_exit_else', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'until')] = ('expression_exit_until', 'stay', 'pop', None)
-        transitions[('expression_starting_with_keyword', c, 'function')] = ('func_body_start', 'stay', 'replace', 'expression_function')
-        transitions[('expression_starting_with_keyword', c, 'not')] = ('expression_not', 'stay', 'pop', None) # unary "not"
-        transitions[('expression_not', c, None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'nil')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'false')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'true')] = ('expression_binop-or-end_with_not_only_name', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'end')] = ('expression_exit_end', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'elseif')] = ('expression_exit_elseif', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'else')] = ('expression_exit_else', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'until')] = ('expression_exit_until', 'stay', 'pop', None)
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'function')] = ('func_body_start', 'stay', 'replace', 'expression_function')
+        transitions[('expression_starting_with_keyword', pda.BYTE[c], 'not')] = ('expression_not', 'stay', 'pop', None) # unary "not"
+        transitions[('expression_not', pda.BYTE[c], None)] = ('expression_restart', 'stay', 'replace', 'not_only_name')
 
     # ======== Expressions that start with punctuation ========
 
@@ -1454,13 +1488,13 @@ def _make_transitions():
 
     # "." can also be the start of a numeral expression (implied leading "0")
     for d in DIGITS:
-        transitions[('expression_.', d, None)] = ('expression_numeric_after_.', 'right', 'push', 'number_dec')
+        transitions[('expression_.', pda.BYTE[d], None)] = ('expression_numeric_after_.', 'right', 'push', 'number_dec')
 
     # Table constructor expression
     transitions[('expression', b'{', None)] = ('table_constructor_start', 'stay', 'push', 'expression_table_constructor')
     for c in ALL:
-        transitions[('table_constructor_end', c, 'expression_table_constructor')] = ('expression_table_constructor_end', 'stay', 'pop', None)
-        transitions[('expression_table_constructor_end', c, None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
+        transitions[('table_constructor_end', pda.BYTE[c], 'expression_table_constructor')] = ('expression_table_constructor_end', 'stay', 'pop', None)
+        transitions[('expression_table_constructor_end', pda.BYTE[c], None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
 
     # Expression starting with '(': handle as LRvalue
     # We have to detect if the value on top of the stack is "beginning"
@@ -1486,28 +1520,28 @@ def _make_transitions():
     # Detect the start of a numeric expression, but keep track of a leading 0 separately for now
     # (Note: the Lua parser uses hardcoded Arabic numeral characters here, too)
     for c in DIGITS:
-        transitions[('expression', c, None)] = ('expression_starting_with_digit', 'stay', 'replace', 'not_only_name')
+        transitions[('expression', pda.BYTE[c], None)] = ('expression_starting_with_digit', 'stay', 'replace', 'not_only_name')
 
-        transitions[('expression_starting_with_digit', c, None)] = ('expression_numeric', 'right', 'push', 'number_dec')
+        transitions[('expression_starting_with_digit', pda.BYTE[c], None)] = ('expression_numeric', 'right', 'push', 'number_dec')
     transitions[('expression_starting_with_digit', b'0', None)] = ('expression_0', 'right', 'push', 'number_dec')
 
     # Check for hexadecimality, and be sure to consume at least one hex digit
     transitions[('expression_0', b'x', None)] = ('expression_0x', 'right', 'replace', 'number_hex')
     transitions[('expression_0', b'X', None)] = ('expression_0x', 'right', 'replace', 'number_hex')
     for c in HEX_DIGITS:
-        transitions[('expression_0x', c, None)] = ('expression_numeric', 'right', 'read', None)
+        transitions[('expression_0x', pda.BYTE[c], None)] = ('expression_numeric', 'right', 'read', None)
 
     # Handle numbers that start with 0 but aren't hex
     for c in DIGITS:
-        transitions[('expression_0', c, None)] = ('expression_numeric', 'right', 'read', None)
+        transitions[('expression_0', pda.BYTE[c], None)] = ('expression_numeric', 'right', 'read', None)
 
     # Either way, we're now in the expression_numeric stage,
     # with either number_dec or number_hex on the stack,
     # and already having consumed one digit (so from this point we should accept 0 or more).
     for c in DIGITS:
-        transitions[('expression_numeric', c, None)] = ('expression_numeric', 'right', 'read', None)
+        transitions[('expression_numeric', pda.BYTE[c], None)] = ('expression_numeric', 'right', 'read', None)
     for c in ONLY_HEX_DIGITS:
-        transitions[('expression_numeric', c, 'number_hex')] = ('expression_numeric', 'right', 'read', None)
+        transitions[('expression_numeric', pda.BYTE[c], 'number_hex')] = ('expression_numeric', 'right', 'read', None)
 
     # If we encounter a ".", read it (in a way that ensures we can only read one of them),
     # and then read zero or more digits.
@@ -1515,9 +1549,9 @@ def _make_transitions():
     for pre_state in ['expression_0', 'expression_0x', 'expression_numeric']:
         transitions[(pre_state, b'.', None)] = ('expression_numeric_after_.', 'right', 'read', None)
     for c in DIGITS:
-        transitions[('expression_numeric_after_.', c, None)] = ('expression_numeric_after_.', 'right', 'read', None)
+        transitions[('expression_numeric_after_.', pda.BYTE[c], None)] = ('expression_numeric_after_.', 'right', 'read', None)
     for c in ONLY_HEX_DIGITS:
-        transitions[('expression_numeric_after_.', c, 'number_hex')] = ('expression_numeric_after_.', 'right', 'read', None)
+        transitions[('expression_numeric_after_.', pda.BYTE[c], 'number_hex')] = ('expression_numeric_after_.', 'right', 'read', None)
 
     # If we find an exponent marker ("e"/"E" for decimal, "p"/"P" for hex), read it
     for pre_state in ['expression_0', 'expression_numeric', 'expression_numeric_after_.']:
@@ -1534,30 +1568,30 @@ def _make_transitions():
     # (Note that digits following the exponent marker HAVE to be decimal, regardless
     # of this number's overall base.)
     for c in DIGITS:
-        transitions[('expression_numeric_exp', c, None)] = ('expression_numeric_exp_value', 'right', 'read', None)
-        transitions[('expression_numeric_exp_+-', c, None)] = ('expression_numeric_exp_value', 'right', 'read', None)
+        transitions[('expression_numeric_exp', pda.BYTE[c], None)] = ('expression_numeric_exp_value', 'right', 'read', None)
+        transitions[('expression_numeric_exp_+-', pda.BYTE[c], None)] = ('expression_numeric_exp_value', 'right', 'read', None)
 
     # ...and then zero or more digits following that one
     for c in DIGITS:
-        transitions[('expression_numeric_exp_value', c, None)] = ('expression_numeric_exp_value', 'right', 'read', None)
+        transitions[('expression_numeric_exp_value', pda.BYTE[c], None)] = ('expression_numeric_exp_value', 'right', 'read', None)
 
     # There are a few places that are valid to exit from, if we read something non-alphanumeric (other than ".")
     # We have to pop the "number_dec" or "number_hex" from the stack, now, also
     for stateToExitFrom in ['expression_0', 'expression_numeric', 'expression_numeric_after_.', 'expression_numeric_exp_value']:
         for c in without(NOT_LISLALNUM, b'.'):
-            transitions[(stateToExitFrom, c, None)] = ('expression_binop-or-end', 'stay', 'pop', None)
+            transitions[(stateToExitFrom, pda.BYTE[c], None)] = ('expression_binop-or-end', 'stay', 'pop', None)
 
 
     # ======== Short literal strings ========
 
     for quote in bstr_to_set(b'\'"'):
-        transitions[('expression', quote, None)] = ('expression_starting_with_quote', 'stay', 'replace', 'not_only_name')
-        transitions[('expression_starting_with_quote', quote, None)] = ('short_string_start', 'stay', 'push', 'expression_short_string')
+        transitions[('expression', pda.BYTE[quote], None)] = ('expression_starting_with_quote', 'stay', 'replace', 'not_only_name')
+        transitions[('expression_starting_with_quote', pda.BYTE[quote], None)] = ('short_string_start', 'stay', 'push', 'expression_short_string')
 
     # (goes through short-string subsystem, and then...)
 
     for c in ALL:
-        transitions[('short_string_end', c, 'expression_short_string')] = ('expression_binop-or-end', 'stay', 'pop', None)
+        transitions[('short_string_end', pda.BYTE[c], 'expression_short_string')] = ('expression_binop-or-end', 'stay', 'pop', None)
 
 
     # ======== Long strings ========
@@ -1574,8 +1608,8 @@ def _make_transitions():
     # We already went through the func_body subsystem, and just have to
     # transition back.
     for c in ALL:
-        transitions[('func_body_end', c, 'expression_function')] = ('expression_after_func_body', 'stay', 'pop', None)
-        transitions[('expression_after_func_body', c, None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
+        transitions[('func_body_end', pda.BYTE[c], 'expression_function')] = ('expression_after_func_body', 'stay', 'pop', None)
+        transitions[('expression_after_func_body', pda.BYTE[c], None)] = ('expression_binop-or-end', 'stay', 'replace', 'not_only_name')
 
 
     ####################################################################
@@ -1600,7 +1634,7 @@ def _make_transitions():
     # If we read an actual expression, either read a comma and read a second expression,
     # or go to the exit state
     for c in ALL:
-        transitions[('expression_list_entry_end', c, None)] = ('expression_list_exit', 'stay', 'read', None)
+        transitions[('expression_list_entry_end', pda.BYTE[c], None)] = ('expression_list_exit', 'stay', 'read', None)
     transitions[('expression_list_entry_end', b',', None)] = ('expression_list_start_2', 'right', 'read', None)
 
     # Read another expression (2nd, 3rd, 4th, etc)
@@ -1619,7 +1653,7 @@ def _make_transitions():
     # Based on statement() in lparser.c.
 
     for c in ALL:
-        transitions[('block', c, None)] = ('statement', 'stay', 'push', 'block')
+        transitions[('block', pda.BYTE[c], None)] = ('statement', 'stay', 'push', 'block')
 
     # {value_on_top_of_stack: destination_state_after_reading_end_keyword}
     STACK_VALUES_POPPED_BY_END_KEYWORD = {
@@ -1707,8 +1741,8 @@ def _make_transitions():
     # If so, the statement is entirely finished at this point, so just
     # go all the way back to the 'statement' state.
     for c in ALL:
-        transitions[('statement_read_lvalue_hopefully', c, 'rvalue')] = ('statement_function_call_maybe', 'stay', 'pop', None)
-        transitions[('statement_function_call_maybe', c, 'function_call')] = ('statement', 'stay', 'pop', None)
+        transitions[('statement_read_lvalue_hopefully', pda.BYTE[c], 'rvalue')] = ('statement_function_call_maybe', 'stay', 'pop', None)
+        transitions[('statement_function_call_maybe', pda.BYTE[c], 'function_call')] = ('statement', 'stay', 'pop', None)
 
     # If the lrvalue ended with a "::", this has to be a function call
     # followed by a label (which we already consumed a portion of)
@@ -1719,7 +1753,7 @@ def _make_transitions():
 
     # Read any more lvalues (separated by commas)
     for c in ALL:
-        transitions[('statement_assign_varlist', c, None)] = ('statement_assign_varlist_2', 'stay', 'read', None)
+        transitions[('statement_assign_varlist', pda.BYTE[c], None)] = ('statement_assign_varlist_2', 'stay', 'read', None)
     read_whitespace('statement_assign_varlist', FAIL_TRANSITION)
     read_lvalue_or_rvalue('statement_assign_varlist_2', False,
         ('statement_assign_read_another_lvalue_hopefully', 'stay', 'read', None),
@@ -1740,28 +1774,28 @@ def _make_transitions():
     # Make transitions from statement_starting_with_keyword to more specific states
     for c in NOT_LISLALNUM:
         # case TK_IF: {  /* stat -> ifstat */
-        transitions[('statement_starting_with_keyword', c, 'if')] = ('statement_if', 'stay', 'replace', 'statement_if')
-        transitions[('statement_starting_with_keyword', c, 'elseif')] = ('statement_elseif', 'stay', 'pop', None)
-        transitions[('statement_starting_with_keyword', c, 'else')] = ('statement_else', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'if')] = ('statement_if', 'stay', 'replace', 'statement_if')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'elseif')] = ('statement_elseif', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'else')] = ('statement_else', 'stay', 'pop', None)
         # case TK_WHILE: {  /* stat -> whilestat */
-        transitions[('statement_starting_with_keyword', c, 'while')] = ('statement_while', 'stay', 'replace', 'statement_while')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'while')] = ('statement_while', 'stay', 'replace', 'statement_while')
         # case TK_DO: {  /* stat -> DO block END */
-        transitions[('statement_starting_with_keyword', c, 'do')] = ('statement', 'stay', 'replace', 'statement_do')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'do')] = ('statement', 'stay', 'replace', 'statement_do')
         # case TK_FOR: {  /* stat -> forstat */
-        transitions[('statement_starting_with_keyword', c, 'for')] = ('statement_for', 'stay', 'replace', 'statement_for')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'for')] = ('statement_for', 'stay', 'replace', 'statement_for')
         # case TK_REPEAT: {  /* stat -> repeatstat */
-        transitions[('statement_starting_with_keyword', c, 'repeat')] = ('statement', 'stay', 'replace', 'statement_repeat')
-        transitions[('statement_starting_with_keyword', c, 'until')] = ('statement_until', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'repeat')] = ('statement', 'stay', 'replace', 'statement_repeat')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'until')] = ('statement_until', 'stay', 'pop', None)
         # case TK_FUNCTION: {  /* stat -> funcstat */
-        transitions[('statement_starting_with_keyword', c, 'function')] = ('statement_function', 'stay', 'replace', 'statement_function')
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'function')] = ('statement_function', 'stay', 'replace', 'statement_function')
         # case TK_LOCAL: {  /* stat -> localstat */
-        transitions[('statement_starting_with_keyword', c, 'local')] = ('statement_local', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'local')] = ('statement_local', 'stay', 'pop', None)
         # case TK_RETURN: {  /* stat -> retstat */
-        transitions[('statement_starting_with_keyword', c, 'return')] = ('statement_return', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'return')] = ('statement_return', 'stay', 'pop', None)
         # case TK_BREAK: {  /* stat -> breakstat */
-        transitions[('statement_starting_with_keyword', c, 'break')] = ('statement', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'break')] = ('statement', 'stay', 'pop', None)
         # case TK_GOTO: {  /* stat -> 'goto' NAME */
-        transitions[('statement_starting_with_keyword', c, 'goto')] = ('statement_goto', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'goto')] = ('statement_goto', 'stay', 'pop', None)
 
     # ---- If statements ----
     # (starts on 'statement_if' state with 'statement_if' on top of stack)
@@ -1778,7 +1812,7 @@ def _make_transitions():
 
     # If we read an "else" while "statement_if" is on top of the stack, go back to the "statement" state
     for c in ALL:
-        transitions[('statement_else', c, 'statement_if')] = ('statement', 'stay', 'read', None)
+        transitions[('statement_else', pda.BYTE[c], 'statement_if')] = ('statement', 'stay', 'read', None)
 
 
     # ---- While statements ----
@@ -1816,7 +1850,7 @@ def _make_transitions():
     transitions[('statement_for_name', b',', None)] = ('statement_genfor_namelist_,', 'right', 'read', None)
     transitions[('statement_for_name', b'i', None)] = ('statement_genfor_namelist_i', 'right', 'read', None)
     for c in ALL:
-        transitions[('statement_genfor_namelist_,', c, None)] = ('statement_genfor_namelist_,_whitespace', 'stay', 'read', None)
+        transitions[('statement_genfor_namelist_,', pda.BYTE[c], None)] = ('statement_genfor_namelist_,_whitespace', 'stay', 'read', None)
     read_whitespace('statement_genfor_namelist_,', FAIL_TRANSITION)
     read_name_list('statement_genfor_namelist_,_whitespace',
         ('statement_genfor_namelist', 'stay', 'read', None),
@@ -1852,7 +1886,7 @@ def _make_transitions():
 
     # Start as if we just read a "."
     for c in IN_LISLALNUM:
-        transitions[('statement_function', c, None)] = ('func_name_.', 'stay', 'read', None)
+        transitions[('statement_function', pda.BYTE[c], None)] = ('func_name_.', 'stay', 'read', None)
 
     # Read whitespace and then another name
     read_whitespace('func_name_.', FAIL_TRANSITION)
@@ -1876,7 +1910,7 @@ def _make_transitions():
 
     # Transition back, checking for 'statement_function' being on the stack
     for c in ALL:
-        transitions[('func_body_end', c, 'statement_function')] = ('statement', 'stay', 'pop', None)
+        transitions[('func_body_end', pda.BYTE[c], 'statement_function')] = ('statement', 'stay', 'pop', None)
 
     # ---- Local statements ----
     # (starts on 'statement_local' state with nothing on top of stack)
@@ -1886,7 +1920,7 @@ def _make_transitions():
 
     # Read whitespace after the "local" keyword
     for c in ALL:
-        transitions[('statement_local', c, None)] = ('statement_local_after_whitespace', 'stay', 'read', None)
+        transitions[('statement_local', pda.BYTE[c], None)] = ('statement_local_after_whitespace', 'stay', 'read', None)
     read_whitespace('statement_local', FAIL_TRANSITION)
 
     read_name_list('statement_local_after_whitespace',
@@ -1899,13 +1933,13 @@ def _make_transitions():
     # If we got an actual name list but there's no '=', this must be
     # just a "local x, y, z" statement. Try to read whatever follows as
     # a statement
-    for c in u8_complement(b'='):
-        transitions[('statement_local_after_name_list', c, None)] = ('statement', 'stay', 'read', None)
+    for c in NOT_EQUALS:
+        transitions[('statement_local_after_name_list', pda.BYTE[c], None)] = ('statement', 'stay', 'read', None)
 
     # If we got a keyword, ensure that it was 'function', and then read
     # the rest of it
     for c in ALL:
-        transitions[('statement_local_read_keyword', c, 'function')] = ('statement_local_function', 'stay', 'pop', None)
+        transitions[('statement_local_read_keyword', pda.BYTE[c], 'function')] = ('statement_local_function', 'stay', 'pop', None)
     read_whitespace('statement_local_function', FAIL_TRANSITION)
     read_name_or_keyword('statement_local_function',
         ('statement_local_function_read_name', 'stay', 'read', None),
@@ -1913,7 +1947,7 @@ def _make_transitions():
     read_whitespace('statement_local_function_read_name', FAIL_TRANSITION)
     transitions[('statement_local_function_read_name', b'(', None)] = ('func_body_start', 'stay', 'push', 'statement_local_function')
     for c in ALL:
-        transitions[('func_body_end', c, 'statement_local_function')] = ('statement', 'stay', 'pop', None)
+        transitions[('func_body_end', pda.BYTE[c], 'statement_local_function')] = ('statement', 'stay', 'pop', None)
 
     # ---- Return statements ----
     # (starts on 'statement_return' state with nothing on top of stack)
@@ -1946,15 +1980,15 @@ def _make_transitions():
     transitions[('statement_return_after_expression_;el', b's', None)] = ('statement_return_after_expression_;els', 'right', 'read', None)
     transitions[('statement_return_after_expression_;els', b'e', None)] = ('statement_return_after_expression_;else', 'right', 'read', None)
     for c in NOT_LISLALNUM:
-        transitions[('statement_return_after_expression_;else', c, None)] = ('statement_return_else', 'stay', 'read', None)
+        transitions[('statement_return_after_expression_;else', pda.BYTE[c], None)] = ('statement_return_else', 'stay', 'read', None)
     transitions[('statement_return_after_expression_;else', b'i', None)] = ('statement_return_after_expression_;elsei', 'right', 'read', None)
     transitions[('statement_return_after_expression_;elsei', b'f', None)] = ('statement_return_after_expression_;elseif', 'right', 'read', None)
     for c in NOT_LISLALNUM:
-        transitions[('statement_return_after_expression_;elseif', c, None)] = ('statement_return_elseif', 'stay', 'read', None)
+        transitions[('statement_return_after_expression_;elseif', pda.BYTE[c], None)] = ('statement_return_elseif', 'stay', 'read', None)
     transitions[('statement_return_after_expression_;e', b'n', None)] = ('statement_return_after_expression_;en', 'right', 'read', None)
     transitions[('statement_return_after_expression_;en', b'd', None)] = ('statement_return_after_expression_;end', 'right', 'read', None)
     for c in NOT_LISLALNUM:
-        transitions[('statement_return_after_expression_;end', c, None)] = ('statement_return_end', 'stay', 'read', None)
+        transitions[('statement_return_after_expression_;end', pda.BYTE[c], None)] = ('statement_return_end', 'stay', 'read', None)
     transitions[('statement_return_after_expression', b'u', None)] = ('statement_return_after_expression_;u', 'right', 'read', None)
     transitions[('statement_return_after_expression_;', b'u', None)] = ('statement_return_after_expression_;u', 'right', 'read', None)
     transitions[('statement_return_after_expression_;u', b'n', None)] = ('statement_return_after_expression_;un', 'right', 'read', None)
@@ -1962,7 +1996,7 @@ def _make_transitions():
     transitions[('statement_return_after_expression_;unt', b'i', None)] = ('statement_return_after_expression_;unti', 'right', 'read', None)
     transitions[('statement_return_after_expression_;unti', b'l', None)] = ('statement_return_after_expression_;until', 'right', 'read', None)
     for c in NOT_LISLALNUM:
-        transitions[('statement_return_after_expression_;until', c, None)] = ('statement_return_until', 'stay', 'read', None)
+        transitions[('statement_return_after_expression_;until', pda.BYTE[c], None)] = ('statement_return_until', 'stay', 'read', None)
 
     # At this point, we should be in one of the following states:
     # - statement_return_else
@@ -1972,15 +2006,16 @@ def _make_transitions():
 
     # Return from "else", "elseif", or "until"
     for c in NOT_LISLALNUM:
-        transitions[('statement_return_else', c, 'statement_if')] = ('statement_else', 'stay', 'read', None)
-        transitions[('statement_return_elseif', c, 'statement_if')] = ('statement_elseif', 'stay', 'read', None)
-        transitions[('statement_return_until', c, 'statement_repeat')] = ('statement_until', 'stay', 'read', None)
+        transitions[('statement_return_else', pda.BYTE[c], 'statement_if')] = ('statement_else', 'stay', 'read', None)
+        transitions[('statement_return_elseif', pda.BYTE[c], 'statement_if')] = ('statement_elseif', 'stay', 'read', None)
+        transitions[('statement_return_until', pda.BYTE[c], 'statement_repeat')] = ('statement_until', 'stay', 'read', None)
 
     # Return from "end"
     # (Ensure that we'll be ending an appropriate block)
     for required_stack_value, dest in STACK_VALUES_POPPED_BY_END_KEYWORD.items():
+        pop_to_dest = (dest, 'stay', 'pop', None)
         for c in NOT_LISLALNUM:
-            transitions[('statement_return_end', c, required_stack_value)] = (dest, 'stay', 'pop', None)
+            transitions[('statement_return_end', pda.BYTE[c], required_stack_value)] = pop_to_dest
 
     # ---- Break statements ----
     # (starts in "statement" state, with nothing on the stack)
@@ -1995,11 +2030,12 @@ def _make_transitions():
     # ======== "end" keyword ========
     # First, we have to pop the "end" off the stack
     for c in NOT_LISLALNUM:
-        transitions[('statement_starting_with_keyword', c, 'end')] = ('statement_end', 'stay', 'pop', None)
+        transitions[('statement_starting_with_keyword', pda.BYTE[c], 'end')] = ('statement_end', 'stay', 'pop', None)
     # Then we pop again to get rid of the "statement_do" or "statement_if" or whatever
     for required_stack_value, dest in STACK_VALUES_POPPED_BY_END_KEYWORD.items():
+        pop_to_dest = (dest, 'stay', 'pop', None)
         for c in NOT_LISLALNUM:
-            transitions[('statement_end', c, required_stack_value)] = (dest, 'stay', 'pop', None)
+            transitions[('statement_end', pda.BYTE[c], required_stack_value)] = pop_to_dest
 
 
     ####################################################################
@@ -2010,12 +2046,12 @@ def _make_transitions():
 
     # "The first line in the file is ignored if it starts with a #."
     for c in ALL:
-        transitions[('start', c, None)] = ('statement', 'stay', 'read', None)
+        transitions[('start', pda.BYTE[c], None)] = ('statement', 'stay', 'read', None)
     transitions[('start', b'#', None)] = ('start_#', 'right', 'read', None)
     for c in ALL:
-        transitions[('start_#', c, None)] = ('start_#', 'right', 'read', None)
+        transitions[('start_#', pda.BYTE[c], None)] = ('start_#', 'right', 'read', None)
     for c in bstr_to_set(b'\r\n'):
-        transitions[('start_#', c, None)] = ('statement', 'right', 'read', None)
+        transitions[('start_#', pda.BYTE[c], None)] = ('statement', 'right', 'read', None)
 
 
     ####################################################################
@@ -2031,6 +2067,7 @@ class Lua_2PDA(pda.TwoPDA):
     """
     2PDA for Lua 5.3
     """
+    __slots__ = ()
     name = 'Lua'
     transitions = _make_transitions()
     initial_state = 'start'
@@ -19,7 +19,9 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import mmap
 import pathlib
+import random
 
 import pytest
 
@@ -27,24 +29,11 @@ import pda_lua
 
 
 DEBUG_LEVEL = 0
-COUNTER = 0
-
-def reset_counter():
-    pass
-    global COUNTER
-    COUNTER = 0
-
-def end():
-    pass
-    raise Exception('Intentional test failure')
 
 def parse_lua(s, *args, **kwargs):
     """
     Helper function that parses something with the appropriate debug_level set
     """
-    global COUNTER
-    COUNTER += 1
-    print(COUNTER)
     if isinstance(s, str):
         s = s.encode('cp1252')
     pda_lua.Lua_2PDA().parse(s, *args, **kwargs, debug_level=DEBUG_LEVEL)
@@ -67,23 +56,109 @@ def iter_whitespace():
     yield make_both(' --[[comment]] ')
 
 
+def parse_lua_file(path):
+    """
+    Helper function that parses a Lua file at the given path
+    (pathlib.Path). It's mapped rather than read, since parse() accepts
+    any bytes-like object, but mmap can't map an empty file.
+    """
+    if not path.stat().st_size:
+        parse_lua(b'')
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        parse_lua(m)
+
+
+LUA_TEST_SUITE_PATHS = sorted((pathlib.Path(__file__).parent / 'lua-5.3' / 'testes').glob('*.lua'))
+
+
 # Add tests corresponding to files in the Lua test suite.
 # You can have these be skipped by running `pytest -m "not luasuite"`
-def make_test_suite_test(path):
+@pytest.mark.luasuite
+@pytest.mark.parametrize('path', LUA_TEST_SUITE_PATHS, ids=lambda path: path.stem)
+def test_lua_test_suite(path):
+    """
+    Test parsing a Lua file at the given path (pathlib.Path)
+    """
+    parse_lua_file(path)
+
+
+def iter_variants(s, rng, count):
+    """
+    Helper function to iterate over variants of byte string s: random
+    chunks of it (starting at line beginnings), some cut off at random
+    points and some with one byte changed, inserted or removed. These
+    mostly end up in the middle of something, and often fail to parse.
     """
-    Factory function for creating a test case that parses a Lua file at
-    the given path (pathlib.Path) and runs it through the 2PDA
+    line_starts = [0] + [i + 1 for i, c in enumerate(s[:-1]) if c == ord('\n')]
+    for _ in range(count):
+        start = rng.choice(line_starts)
+        chunk = bytearray(s[start : start + rng.randrange(1, 1000)])
+        i = rng.randrange(len(chunk))
+        c = rng.choice([rng.randrange(256), rng.choice(b'"\'[]=-\n\\{}().')])
+        kind = rng.randrange(4)
+        if kind == 0:
+            del chunk[i:]
+        elif kind == 1:
+            chunk[i] = c
+        elif kind == 2:
+            chunk.insert(i, c)
+        else:
+            del chunk[i]
+        yield bytes(chunk)
+
+
+def parse_result(parse, s):
     """
-    @pytest.mark.luasuite
-    def test():
-        parse_lua(path.read_bytes())
+    Helper function that parses s with a new Lua 2PDA, using the given
+    method (Lua_2PDA.parse or Lua_2PDA.parse_debug), and returns
+    (state, stack, error message or None)
+    """
+    p = pda_lua.Lua_2PDA()
+    try:
+        parse(p, s, debug_level=0)
+        error = None
+    except RuntimeError as e:
+        error = str(e)
+    return p.state, p.stack, error
 
-    return test
 
-for p in pathlib.Path('lua-5.3/testes/').glob('*.lua'):
-    globals()[f'test_lua_test_suite_{p.stem}'] = make_test_suite_test(p)
+# parse() runs the compiled transition tables, which have been through
+# several optimization passes (see TwoPDA._build_tables()), while
+# parse_debug() follows the transitions dictionary one character at a
+# time. These tests check that both end up in the same state, with the
+# same stack and the same error (if any).
+@pytest.mark.luasuite
+@pytest.mark.parametrize('path', LUA_TEST_SUITE_PATHS, ids=lambda path: path.stem)
+def test_compiled_tables(path):
+    """
+    Test that parse() and parse_debug() agree on a Lua file at the given
+    path (pathlib.Path), and on variants of it
+    """
+    s = path.read_bytes()
+    rng = random.Random(path.name)
+    for variant in [s, *iter_variants(s, rng, 30)]:
+        assert parse_result(pda_lua.Lua_2PDA.parse, variant) == parse_result(pda_lua.Lua_2PDA.parse_debug, variant)
 
-del make_test_suite_test
+
+def test_empty_file(tmp_path):
+    """
+    Test parsing an empty Lua file
+    """
+    path = tmp_path / 'empty.lua'
+    path.write_bytes(b'')
+    parse_lua_file(path)
+
+
+def test_mmap_parse_error(tmp_path):
+    """
+    Test that a parse error in mmapped input is reported as such, and
+    doesn't prevent closing the mmap
+    """
+    path = tmp_path / 'invalid.lua'
+    path.write_bytes(b'oh no invalid syntax')
+    with pytest.raises(RuntimeError):
+        parse_lua_file(path)
 
 
 def helper_test_multiline_comment_or_long_string(prefix):
@@ -124,15 +199,15 @@ def helper_test_multiline_comment_or_long_string(prefix):
     parse_lua((prefix + '[=[ ツ ]]=]' + check_closed('=')).encode('utf-8'))
 
     # Some things that should *not* parse
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(prefix + '[[multiline\rcomment\n]=]' + check_closed(''))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(prefix + '[=[multiline\rcomment\n]]' + check_closed('='))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(prefix + '[=[multiline\rcomment\n]==]' + check_closed('='))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(prefix + '[=[multiline\rcomment\n]]]' + check_closed('='))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(prefix + '[=[multiline\rcomment\n]]==]' + check_closed('='))
 
 
@@ -150,19 +225,19 @@ def helper_test_function_bodies(prefix):
         parse_lua(prefix + '( a , b , ... ) end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua(prefix + '( a , bb , ccc , ... ) end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( .. )_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( a , )_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( , a )_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( a_b ) end_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( a ... ) end_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( a , ... , c )_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(prefix + '( ) end_end_'.replace(' ', ws).replace('_', ws_sep))
 
 
@@ -170,23 +245,20 @@ def test_bang():
     """
     Test that "The first line in the file is ignored if it starts with a #."
     """
-    reset_counter()
     # Single-line
     parse_lua('#shebang line\ndo --\n end')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('#shebang line\noh no invalid syntax')
-    end()
 
 
 def test_comment():
     """
     Test parsing comments
     """
-    reset_counter()
     # Single-line
     parse_lua(' --this is a comment\ndo end')
     parse_lua('do --\n end')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua(' --this is a comment\noops the comment ended')
 
     helper_test_multiline_comment_or_long_string('--')
@@ -197,7 +269,6 @@ def test_comment():
     parse_lua('do --[\n end')
     parse_lua('do --[=\n end')
     parse_lua('do --[==\n end')
-    end()
 
 
 
@@ -205,32 +276,27 @@ def test_name():
     """
     Test name parsing
     """
-    reset_counter()
 
     parse_lua('a = 1;')
     parse_lua('abc123 = 1;')
     parse_lua('_abc_123_ = 1;')
 
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('123abc = 1;')
-    end()
 
 
 def test_semicolon():
     """
     Test the semicolon statement
     """
-    reset_counter()
     parse_lua(';')
     parse_lua('; ;;; ; ;; ; ;;;;;;;   ; ;; ')
-    end()
 
 
 def test_assignment_statement():
     """
     Test assignment statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         for exp in ['nil', '1', '-23', 'd', 'a.b(c)[d]']: # important to check that negative numbers work
             parse_lua(f'a = {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
@@ -238,28 +304,26 @@ def test_assignment_statement():
             parse_lua(f'a , bb . cc = {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
             parse_lua(f'a , bb , ccc . ddd = {exp} , {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
 
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a , b {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a , if = {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('a , b = if ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('a , b , c ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('a , b , c , ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('a , b , c = ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_function_call_statement():
     """
     Test parsing function-call statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
 
         # ======== Var ========
@@ -267,45 +331,45 @@ def test_function_call_statement():
         parse_lua('a [ -23 ] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # [exp]
         parse_lua('a . b = 1 ;_'.replace(' ', ws).replace('_', ws_sep))                   # .name
         parse_lua('( a ) . c = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # starting with (
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # :name, with no args
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b ( 1 , 2 ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))     # :name (args)
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua("a : b 'arg' = 1 ;_".replace(' ', ws).replace('_', ws_sep))         # :name 'string argument'
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b "arg" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # :name "string argument"
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b [[arg]] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))       # :name [[string argument]]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b [==[arg]==] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))   # :name [==[string argument]==]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b { 1 , 2 ; 3 } = 1 ;_'.replace(' ', ws).replace('_', ws_sep)) # :name {table constructor argument}
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a ( 1 , 2 ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # (args)
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua("a 'arg' = 1 ;_".replace(' ', ws).replace('_', ws_sep))             # 'string argument'
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a "arg" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))             # "string argument"
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [[ arg ]] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # [[string argument]]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [==[arg]==] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))       # [==[string argument]==]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a { 1 , 2 ; 3 } = 1 ;_'.replace(' ', ws).replace('_', ws_sep))     # {table constructor argument}
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('( a ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # starting with (, with nothing following
 
         # Test chaining multiple parts
 
         parse_lua('a ( b ) . c [ e ] "f" [[g]] [ h . i ] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a ( b ) . c [ e ] "f" [[g]] [ h . i ] ( ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
 
         parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) . j = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) "j" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # ======== Prefixexp ========
@@ -327,43 +391,40 @@ def test_function_call_statement():
             parse_lua(f'a = a {{ {exp} , {exp} ; {exp} }} ;_'.replace(' ', ws).replace('_', ws_sep))     # {table constructor argument}
             parse_lua( 'a = ( a ) ;_'.replace(' ', ws).replace('_', ws_sep))                             # starting with (
             parse_lua( 'a = ( a ) . b ;_'.replace(' ', ws).replace('_', ws_sep))                         # starting with (, with something else following
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua( 'a = a : b ;_'.replace(' ', ws).replace('_', ws_sep))                             # :name, with no args
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua( 'a = ( a , b ) ;_'.replace(' ', ws).replace('_', ws_sep))                         # this should not be read as a function call
 
         # Test chaining multiple parts
 
         parse_lua('a = a ( b ) . c [ e ] "f" [[g]] [ h . i ] ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = a ( b ) . c [ e ] "f" [[g]] [ h . i ] : j ;_'.replace(' ', ws).replace('_', ws_sep))
 
         parse_lua('a = a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) . j ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) : j ;_'.replace(' ', ws).replace('_', ws_sep))
 
-    end()
-
 
 def test_label_statement():
     """
     Test the label statement
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua(':: x :: ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua(';; :: abcdefg :: ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('do ;; :: abcdefg :: ;; end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(':: :: ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(':: 33 :: ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(':: if :: ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(':: x : ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(': x :: ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Test labels following all kinds of expressions where it could
@@ -376,133 +437,120 @@ def test_label_statement():
         parse_lua('b ( ) :: label :: ;_'.replace(' ', ws).replace('_', ws_sep))
         # ...repeat-until loop statement:
         parse_lua('repeat ; until_a :: label :: ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_break_statement():
     """
     Test parsing the break statement
     """
-    reset_counter()
     parse_lua('break')
 
     for ws, ws_sep in iter_whitespace():
         parse_lua('do break end'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_goto_statement():
     """
     Test parsing goto statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('goto_x ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('goto_xyz ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('goto_5 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('goto ( x ) ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_do_statement():
     """
     Test parsing do-end blocks
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('do end'.replace(' ', ws_sep))
         parse_lua('do do end end'.replace(' ', ws_sep))
         parse_lua('do end do end'.replace(' ', ws_sep))
         parse_lua('do ;; ;; do ;; end ; end ;;;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('do_end_end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_while_statement():
     """
     Test parsing while statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('while_nil_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('while_true_do ; end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('while_-23_do ;;; do_end_end_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while ; do ; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while_true_then_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while_..._do_else_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('while_nil_do_end_end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_repeat_statement():
     """
     Test parsing repeat statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('repeat_until_-23 ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('repeat ;;; do_end_until_..._do_end ;_'.replace(' ', ws).replace('_', ws_sep))
         # Test that it handles the "expression parser tries to read 'and' but fails" case
         parse_lua('repeat_until_5_andz ( nil , nil ) do_end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat_nil ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat_until_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat ; until ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat_then ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat_else_until ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat ; until_false_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('repeat ; until_nil_until_nil ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_if_statement():
     """
     Test parsing if statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('if_true_then_end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('if_..._then_elseif_true_then_else_end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('if_-23_then ; elseif_true_then ; else_end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_then_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_nil_then_elseif_then_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_nil ; then_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_nil_then_elseif_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('else ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('elseif ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('if_nil_then_end_end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_numerical_for_loop_statement():
@@ -510,23 +558,21 @@ def test_numerical_for_loop_statement():
     Test parsing "numerical" for-loop statements, i.e.
     stat ::= for Name ‘=’ exp ‘,’ exp [‘,’ exp] do block end
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('for_a = b , c_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('for_a = b , c , d_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('for_a = -1 , -2 , -3_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a = b do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a = b , c , d , e_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_true = b_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a, b = b_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a = b_do ;;; end_end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_generic_for_loop_statement():
@@ -534,28 +580,25 @@ def test_generic_for_loop_statement():
     Test parsing "generic" for-loop statements, i.e.
     stat ::= for namelist in explist do block end
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('for_a_in_b_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('for_a , b , c_in_d , e , f_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('for_a_in_nil , -23 , true , b . c [ e ] { f } "g" ( h ) do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a_in_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_in_b_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_true_in_b_do ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('for_a_in_b_do ;;; end_end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_function_statement():
     """
     Test parsing function statements
     """
-    reset_counter()
     helper_test_function_bodies('function x.y.z:a')
 
     for ws, ws_sep in iter_whitespace():
@@ -572,24 +615,22 @@ def test_function_statement():
         parse_lua('function xyz123abc(a) ;;; end ')
 
         # Test functions with invalid names
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function () end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_nil ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_end ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_3 ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_a : b : c ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_local_function_statement():
     """
     Test parsing local-function statements
     """
-    reset_counter()
     helper_test_function_bodies('local function x')
 
     for ws, ws_sep in iter_whitespace():
@@ -598,28 +639,26 @@ def test_local_function_statement():
         parse_lua('local_function_xyz123abc ( a ) ;;; end ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Test local functions with invalid names
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_nil ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_end ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_3 ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_a . b ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_a : b ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('local_function_a_b ( ) end ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_local_assignment_statement():
     """
     Test parsing local-assignment statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         for exp in ['nil', '1', '-23', 'a.b(c)[d]']: # important to check that negative numbers work
             parse_lua(f'local_a ;_'.replace(' ', ws).replace('_', ws_sep))
@@ -630,32 +669,30 @@ def test_local_assignment_statement():
             parse_lua(f'local_a , bb = {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
             parse_lua(f'local_a , bb , ccc = {exp} , {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
 
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'local_a_{exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'local_a , b_{exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'local_a , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'local_a , b , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'local_a , if = {exp} , {exp} ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('local_a , b = if ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('local_a , b , c , ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('local_a , b , c = ;_'.replace(' ', ws).replace('_', ws_sep))
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua('local_a_b = ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_return_statement():
     """
     Test parsing return statements
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         for semicolon in ['_', ';']:
             for explist in ['_', '_nil_', '_nil , nil_', '_nil , nil , nil_', '_-23_']:
@@ -666,69 +703,67 @@ def test_return_statement():
                 parse_lua(f'if_nil_then_return {explist} {semicolon} elseif_nil_then_do_end_end ;_'.replace(' ', ws).replace('_', ws_sep))
                 parse_lua(f'repeat_return {explist} {semicolon} until_nil ;_'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_x ( ) return_nil , end_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_x ( ) return_nil , ; end_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_x ( ) return , ; end_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('return , ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('function_x ( ) return_nil_do_end_end_do_end;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_var_and_prefixexp():
     """
     Test parsing "var"s and "prefixexp"s (from the Lua grammar)
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
 
         # ======== Var ========
         parse_lua('a = 1 ;_'.replace(' ', ws).replace('_', ws_sep))                       # (none)
         parse_lua('a [ -23 ] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # [exp]
         parse_lua('a . b = 1 ;_'.replace(' ', ws).replace('_', ws_sep))                   # .name
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # :name, with no args
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b ( 1 , 2 ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))     # :name (args)
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua("a : b 'arg' = 1 ;_".replace(' ', ws).replace('_', ws_sep))         # :name 'string argument'
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b "arg" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # :name "string argument"
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b [[arg]] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))       # :name [[string argument]]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b [==[arg]==] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))   # :name [==[string argument]==]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a : b { 1 , 2 ; 3 } = 1 ;_'.replace(' ', ws).replace('_', ws_sep)) # :name {table constructor argument}
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a ( 1 , 2 ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # (args)
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a ( ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))               # ()
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua("a 'arg' = 1 ;_".replace(' ', ws).replace('_', ws_sep))             # 'string argument'
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a "arg" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))             # "string argument"
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [[ arg ]] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))         # [[string argument]]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [==[arg]==] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))       # [==[string argument]==]
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a { 1 , 2 ; 3 } = 1 ;_'.replace(' ', ws).replace('_', ws_sep))     # {table constructor argument}
 
         # Test chaining multiple parts
 
         parse_lua('a ( b ) . c [ e ] "f" [[g]] [ h . i ] = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a ( b ) . c [ e ] "f" [[g]] [ h . i ] ( ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
 
         parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) . j = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) "j" = 1 ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # ======== Prefixexp ========
@@ -748,48 +783,44 @@ def test_var_and_prefixexp():
             parse_lua( 'a = a [[arg]] ;_'.replace(' ', ws).replace('_', ws_sep))                         # [[string argument]]
             parse_lua( 'a = a [==[arg]==] ;_'.replace(' ', ws).replace('_', ws_sep))                     # [==[string argument]==]
             parse_lua(f'a = a {{ {exp} , {exp} ; {exp} }} ;_'.replace(' ', ws).replace('_', ws_sep))     # {table constructor argument}
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua( 'a = a : b ;_'.replace(' ', ws).replace('_', ws_sep))                             # :name, with no args
 
         # Test chaining multiple parts
 
         parse_lua('a = a ( b ) . c [ e ] "f" [[g]] [ h . i ] ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = a ( b ) . c [ e ] "f" [[g]] [ h . i ] : j ;_'.replace(' ', ws).replace('_', ws_sep))
 
         parse_lua('a = a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) . j ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = a [=[b]=] [ c ] \'d\' { e } . f . g : h ( i ) : j ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_singleton_expression():
     """
     Test parsing expressions "nil", "false", "true", and "..."
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         for semicolon in ['_', ';']:
             for exp in ['_nil', '_false', '_true', '...']:
                 parse_lua(f'do_return {exp}{semicolon}end_do_end ;_'.replace(' ', ws).replace('_', ws_sep))
                 parse_lua(f'a = {exp} , {exp} {semicolon}'.replace(' ', ws).replace('_', ws_sep))
 
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = ._'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = .._'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = .;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = ..;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_numeral_expression():
     """
     Test parsing numeral expressions
     """
-    reset_counter()
     # There are a lot of possible numbers, and it's easy to miss some
     # cases, so we'll generate a representative case for pretty much
     # every situation.
@@ -832,21 +863,21 @@ def test_numeral_expression():
                         parse_lua(f'a = {expL} ; ')
                         parse_lua(f'a = {expU} ; ')
 
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0D2 ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 5D2 ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0x ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 12e ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0x34p ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0x34pFE ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = . ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = .e5 ; ')
 
     # Note: llex.c mentions "3-4" and "0xe+1" as test cases that should be
@@ -855,18 +886,16 @@ def test_numeral_expression():
     # used, an expression would be also accepted instead.
 
     # Additional tests from Lua test suite (literals.lua):
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0xe- ; ')
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('a = 0xep-p ; ')
-    end()
 
 
 def test_string_expression():
     """
     Test parsing string expressions
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         if '\n' in ws: continue # causes too many problems
 
@@ -884,7 +913,7 @@ def test_string_expression():
 
         # \xXX hex escapes
         parse_lua(r'a = "hello \x00 \xfF \x78 world" ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(r'a = "hello \x2 world" ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # \d, \dd, \ddd decimal escapes
@@ -892,25 +921,25 @@ def test_string_expression():
         parse_lua(r'a = "hello \240 \250 \255 \25599 \255F world" ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua(r'a = "hello \2a \25a \255a world" ;_'.replace(' ', ws).replace('_', ws_sep))
         for v in ['256', '260', '300', '999']:
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a = "hello \\{v} world" ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # \u{XXX} unicode literals
         parse_lua(r'a = "hello \u{0} \u{1234CDEF} \u{0001234CDEF} world" ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua(r'a = "hello \u{7FFFFFFF} \u{0007FFFFFFF} world" ;_'.replace(' ', ws).replace('_', ws_sep))
         for v in ['700000000', '7FFFFFFF0', '80000000', '8FFFFFFF', 'FFFFFFFF']:
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a = "hello \\u{v} world" ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(r'a = "hello \u{} world" ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Test illegal linebreaks
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua(f'a = "hello\nworld" ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Test some random invalid escapes
         for esc in 'cdyq!#*':
-            with pytest.raises(Exception):
+            with pytest.raises(RuntimeError):
                 parse_lua(f'a = "hello\\{esc}world" ;_'.replace(' ', ws).replace('_', ws_sep))
 
     # Test non-ASCII characters
@@ -919,23 +948,19 @@ def test_string_expression():
     # Test long-form strings
     # These ignore escape sequences so we don't have to test that
     helper_test_multiline_comment_or_long_string('a =')
-    end()
 
 
 def test_function_expression():
     """
     Test parsing function expressions
     """
-    reset_counter()
     helper_test_function_bodies('a = function')
-    end()
 
 
 def test_table_constructor_expression():
     """
     Test parsing table constructor expressions
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         # Empty table constructors, with varying whitespace
         parse_lua('a = { } ;_'.replace(' ', ws).replace('_', ws_sep))
@@ -945,11 +970,11 @@ def test_table_constructor_expression():
         parse_lua('a = { [ b . c : e ( f ) ] = g ( h ) . i [ nil ] } ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = { [ b . c : e ( f ) ] = g ( h ) . i [ -23 ] ; } ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = { [ b . c : e ( f ) ] = g ( h ) . i [ ... ] , } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { [ 5 ] } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { [ 5 ] = } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { [ for ] = nil } ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Field format: name = exp
@@ -957,11 +982,11 @@ def test_table_constructor_expression():
         parse_lua('a = { a = g ( h ) . i [ nil ] } ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = { a = g ( h ) . i [ -23 ] ; } ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = { a = g ( h ) . i [ ... ] , } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { five = } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { 7 = 5 } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { nil = 5 } ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Field format: exp
@@ -975,9 +1000,9 @@ def test_table_constructor_expression():
         if '[[' not in ws:
             parse_lua('a = { [[ [long string starting with single square bracket ]] } ;_'.replace(' ', ws).replace('_', ws_sep))
             parse_lua('a = { [[ [long string starting with single square bracket ]] , } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { 5 = } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { [[ [this should be a syntax error]] ] } ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Multiple fields
@@ -991,18 +1016,16 @@ def test_table_constructor_expression():
         parse_lua('a = { [ f ( 1 ) ] = g ; "x" , "y" ; x = 1 , f ( x ) , [ 30 ] = 23 ; 45 } ;_'.replace(' ', ws).replace('_', ws_sep))
 
         # Table constructors with only a field separator (illegal)
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { , } ;_'.replace(' ', ws).replace('_', ws_sep))
-        with pytest.raises(Exception):
+        with pytest.raises(RuntimeError):
             parse_lua('a = { ; } ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_binary_operator_expression():
     """
     Test parsing binary-operator expressions
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         for op1 in 'b2':
             for op2 in 'c3':
@@ -1024,7 +1047,7 @@ def test_binary_operator_expression():
     parse_lua('local_a = 5_az ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
     parse_lua('local_a = 5_an ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
     parse_lua('local_a = 5_anz ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('local_a = 5_and ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
     parse_lua('local_a = 5_andz ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
 
@@ -1035,20 +1058,17 @@ def test_binary_operator_expression():
     # (And same for "or")
     parse_lua('local_a = 5_o ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
     parse_lua('local_a = 5_oz ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
-    with pytest.raises(Exception):
+    with pytest.raises(RuntimeError):
         parse_lua('local_a = 5_or ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
     parse_lua('local_a = 5_orz ( nil , nil ) ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
 
 
 def test_unary_operator_expression():
     """
     Test parsing unary-operator expressions
     """
-    reset_counter()
     for ws, ws_sep in iter_whitespace():
         parse_lua('a = - 1 ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = not_1 ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = # 1 ;_'.replace(' ', ws).replace('_', ws_sep))
         parse_lua('a = ~ 1 ;_'.replace(' ', ws).replace('_', ws_sep))
-    end()
@@ -0,0 +1,305 @@
+# Copyright (c) 2020 Kevin Stevens
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+
+import pytest
+
+import pda
+
+
+def test_no_transitions():
+    """
+    Test that a 2PDA without transitions (like TwoPDA itself) can be
+    instantiated, and accepts only empty input
+    """
+    p = pda.TwoPDA()
+    p.parse(b'')
+    assert p.state is None
+    assert p.stack == ()
+
+    with pytest.raises(RuntimeError):
+        pda.TwoPDA().parse(b'x')
+    with pytest.raises(RuntimeError):
+        pda.TwoPDA().parse(b'x', debug_level=2)
+
+
+def make_pda(transitions, initial_state='a'):
+    """
+    Helper function that makes a 2PDA class with the given transitions,
+    which doesn't use the compiled-table cache
+    """
+    return type('TestPDA', (pda.TwoPDA,), {
+        '__slots__': (),
+        'transitions': transitions,
+        'initial_state': initial_state,
+        'cache_compiled': False,
+    })
+
+
+def parse_both(pda_class, input):
+    """
+    Helper function that parses input with both parse() and
+    parse_debug(), asserts that they agree, and returns the result as
+    (state, stack, error message or None)
+    """
+    results = []
+    for debug in [False, True]:
+        p = pda_class()
+        try:
+            if debug:
+                p.parse_debug(input)
+            else:
+                p.parse(input)
+            error = None
+        except RuntimeError as e:
+            error = str(e)
+        results.append((p.state, p.stack, error))
+
+    assert results[0] == results[1]
+    return results[0]
+
+
+def compiled_transition(pda_class, state, c, stack_top=None):
+    """
+    Helper function that returns a compiled transition (see
+    TwoPDA._build_tables()), with state and stack symbol IDs translated
+    back to names (except for OP_SKIP's match function)
+    """
+    pda_class._compile()
+    new_state, advance, op, value = pda_class._rows[pda_class._state_ids[state]][pda_class._symbol_ids[stack_top]][c[0]]
+    if op != pda.OP_SKIP:
+        value = pda_class._symbol_names[value]
+    return pda_class._state_names[new_state], advance, op, value
+
+
+def test_stack_property():
+    """
+    Test that the stack property gives snapshots, and can be assigned
+    only stack symbols that the transitions use
+    """
+    P = make_pda({
+        ('a', b'x', None): ('a', 'right', 'push', 'X'),
+        ('a', b'y', 'X'): ('a', 'right', 'pop', None),
+    })
+
+    p = P()
+    p.parse(b'xx')
+    assert p.stack == ('X', 'X')
+    p.stack = ['X']
+    p.parse(b'yx')
+    assert p.stack == ('X',)
+
+    with pytest.raises(ValueError):
+        p.stack = ['X', 'Z']
+    assert p.stack == ('X',)
+
+
+def test_fold_stay_chain_ending_in_push():
+    """
+    Test folding a chain of "stay" transitions that ends in a push
+    """
+    P = make_pda({
+        ('a', b'x', None): ('b', 'stay', 'read', None),
+        ('b', b'x', None): ('c', 'stay', 'push', 'X'),
+        ('c', b'x', 'X'): ('a', 'right', 'read', None),
+    })
+
+    # (The whole chain should have become a single step)
+    assert compiled_transition(P, 'a', b'x') == ('a', 1, pda.OP_PUSH, 'X')
+
+    assert parse_both(P, b'xx') == ('a', ('X', 'X'), None)
+    assert parse_both(P, b'xy')[2].endswith('at index 1')
+
+
+def test_fold_stay_chain_with_pop():
+    """
+    Test folding "stay" chains that pop, including when the stack is
+    empty
+    """
+    P = make_pda({
+        ('a', b'p', None): ('a', 'right', 'push', 'P'),
+        ('a', b'x', None): ('b', 'stay', 'read', None),
+        ('b', b'x', None): ('c', 'stay', 'pop', None),
+        ('c', b'x', None): ('a', 'right', 'read', None),
+        ('a', b'q', None): ('d', 'stay', 'push', 'Q'),
+        ('d', b'q', 'Q'): ('e', 'stay', 'pop', None),
+        ('e', b'q', None): ('a', 'right', 'read', None),
+    })
+
+    # (A push followed by a pop cancels out)
+    assert compiled_transition(P, 'a', b'q') == ('a', 1, pda.OP_READ, None)
+
+    assert parse_both(P, b'ppxqx') == ('a', (), None)
+    assert parse_both(P, b'pqq') == ('a', ('P',), None)
+
+    # Popping an empty stack should fail in the same state as without
+    # folding
+    state, stack, error = parse_both(P, b'pxx')
+    assert (state, stack) == ('b', ())
+    assert error.endswith('at index 2')
+    state, stack, error = parse_both(P, b'qx')
+    assert (state, stack) == ('b', ())
+    assert error.endswith('at index 1')
+
+
+def test_fold_stay_cycle():
+    """
+    Test that folding terminates on a cycle of "stay" transitions, and
+    doesn't affect input that never enters it
+    """
+    P = make_pda({
+        ('a', b'x', None): ('a', 'right', 'read', None),
+        ('a', b'y', None): ('b', 'stay', 'read', None),
+        ('b', b'y', None): ('c', 'right', 'push', 'Y'),
+        ('c', b'z', 'Y'): ('d', 'stay', 'replace', 'Z'),
+        ('d', b'z', 'Z'): ('c', 'stay', 'replace', 'Y'),
+        ('c', b'x', 'Y'): ('a', 'right', 'pop', None),
+        ('c', b'x', None): ('a', 'right', 'read', None),
+        ('e', b'z', None): ('f', 'stay', 'read', None),
+        ('f', b'z', None): ('e', 'stay', 'read', None),
+    })
+
+    # (Still a "stay" transition, since the chain never moves right)
+    assert compiled_transition(P, 'c', b'z', 'Y')[1] == 0
+
+    assert parse_both(P, b'xyxyx') == ('a', (), None)
+    assert parse_both(P, b'xy') == ('c', ('Y',), None)
+    assert parse_both(P, b'xyy')[2].endswith('at index 2')
+
+
+def test_compiled_cache_same_named_classes():
+    """
+    Test that classes with the same name don't load or evict each
+    other's cached tables, and that classes whose transitions might not
+    match their source code aren't cached at all
+    """
+    def make_cached_pda(c, qualname):
+        return type('CacheTestPDA', (pda.TwoPDA,), {
+            '__slots__': (),
+            '__qualname__': qualname,
+            'transitions': {('a', c, None): ('a', 'right', 'read', None)},
+            'initial_state': 'a',
+        })
+
+    A = make_cached_pda(b'a', 'A.CacheTestPDA')
+    B = make_cached_pda(b'b', 'B.CacheTestPDA')
+    directory = os.path.dirname(A._cache_path())
+    stale_path = os.path.join(directory, 'test_pda.A.CacheTestPDA.0123456789abcdef.2pda')
+    try:
+        assert A._cache_path() != B._cache_path()
+        os.makedirs(directory, exist_ok=True)
+        open(stale_path, 'wb').close()
+
+        B().parse(b'bb')
+        A().parse(b'aa')
+        assert os.path.exists(A._cache_path())
+        assert os.path.exists(B._cache_path())
+        assert not os.path.exists(stale_path)
+
+        # (A fresh class loads the cache file written for A)
+        A2 = make_cached_pda(b'a', 'A.CacheTestPDA')
+        A2._compile()
+        assert A2._rows is not A._rows
+        A2().parse(b'aa')
+        with pytest.raises(RuntimeError):
+            B().parse(b'aa')
+
+    finally:
+        for filename in os.listdir(directory):
+            if filename.startswith(('test_pda.A.CacheTestPDA.', 'test_pda.B.CacheTestPDA.')):
+                os.remove(os.path.join(directory, filename))
+
+    class LocalPDA(pda.TwoPDA):
+        __slots__ = ()
+        transitions = {('a', b'a', None): ('a', 'right', 'read', None)}
+        initial_state = 'a'
+    assert LocalPDA._cache_path() is None
+
+    C = make_cached_pda(b'a', 'C.CacheTestPDA')
+    C.transitions = {('a', b'c', None): ('a', 'right', 'read', None)}
+    assert C._cache_path() is None
+    C().parse(b'cc')
+
+
+def test_run_skips():
+    """
+    Test that skipping a run of bytes that loop back to the same state
+    gives the same results as stepping through them one at a time
+    """
+    transitions = {
+        ('a', b'"', None): ('s', 'right', 'read', None),
+        ('s', b'"', None): ('a', 'right', 'read', None),
+        ('a', b'#', None): ('t', 'right', 'read', None),
+    }
+    for c in range(256):
+        if c != ord('"'):
+            transitions[('s', bytes([c]), None)] = ('s', 'right', 'read', None)
+        transitions[('t', bytes([c]), None)] = ('t', 'right', 'read', None)
+    P = make_pda(transitions)
+
+    assert compiled_transition(P, 's', b'x')[2] == pda.OP_SKIP
+    assert compiled_transition(P, 't', b'"')[2] == pda.OP_SKIP
+
+    # Runs in the middle of the input, at the end, and empty ones (where
+    # the exit byte comes first)
+    assert parse_both(P, b'"abc\xff\n"') == ('a', (), None)
+    assert parse_both(P, b'"abc') == ('s', (), None)
+    assert parse_both(P, b'""""') == ('a', (), None)
+    assert parse_both(P, b'"abc"') == ('a', (), None)
+    assert parse_both(P, b'"abc"x')[2].endswith('at index 5')
+    assert parse_both(P, b'x"abc"')[2].endswith('at index 0')
+
+    # A state that loops on every byte
+    assert parse_both(P, b'"a"#a"b\n\x00') == ('t', (), None)
+    assert parse_both(P, b'#') == ('t', (), None)
+
+
+def test_parse_error_indicator(capsys):
+    """
+    Test the line number and position printed for a parse error with
+    debug_level >= 1
+    """
+    P = make_pda({
+        ('a', b'x', None): ('a', 'right', 'read', None),
+        ('a', b'\n', None): ('a', 'right', 'read', None),
+    })
+
+    with pytest.raises(RuntimeError):
+        P().parse(b'xx\nxy\nxx', debug_level=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == '[line 2] xy'
+    assert lines[2] == ' ' * len('[line 2] ') + '-^'
+
+    with pytest.raises(RuntimeError):
+        P().parse(b'\n\n\ny', debug_level=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == '[line 4] y'
+    assert lines[2] == ' ' * len('[line 4] ') + '^'
+
+    # The caret should still line up when the line has both kinds of
+    # quotes, and only the part before the error has a "'"
+    P = make_pda({('a', bytes([c]), None): ('a', 'right', 'read', None) for c in b'x\' "'})
+    with pytest.raises(RuntimeError):
+        P().parse(b'''x'x y "''', debug_level=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == '''[line 1] x'x y "'''
+    assert lines[2] == ' ' * len('[line 1] ') + '----^'